@@ -3,18 +3,59 @@ Configuration management for RS232 Spoofer
 Handles loading, saving, and validation of application settings
 """
 
+import copy
 import json
 import os
-from typing import Dict, Any, Optional
+from collections import ChainMap
+from types import MappingProxyType
+from typing import Dict, Any, Optional, MutableMapping
 import logging
 
+import serial
+
+# orjson is optional; fall back to the standard library when unavailable
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _json_loads(data: bytes) -> Any:
+    """Decode JSON from raw file contents"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _json_dumps(obj: Any) -> bytes:
+    """Encode an object as indented JSON, ready for a single write"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode('utf-8')
+
+_PARITY_MAP = {
+    'none': serial.PARITY_NONE,
+    'even': serial.PARITY_EVEN,
+    'odd': serial.PARITY_ODD,
+    'mark': serial.PARITY_MARK,
+    'space': serial.PARITY_SPACE
+}
+
+# Settings restricted to a fixed set of values: (key, allowed values, default)
+_ENUM_RULES = (
+    ('baud_rate', frozenset({300, 600, 1200, 2400, 4800, 9600, 19200, 38400, 57600, 115200}), 9600),
+    ('data_bits', frozenset({5, 6, 7, 8}), 8),
+    ('parity', frozenset(_PARITY_MAP), 'none'),
+    ('stop_bits', frozenset({1, 1.5, 2}), 1),
+    ('log_format', frozenset({'ascii', 'hex', 'both'}), 'both'),
+    ('theme', frozenset({'light', 'dark'}), 'light'),
+)
+
 class ConfigManager:
     def __init__(self, config_file: str = "config.json"):
         self.config_file = config_file
         self.logger = logging.getLogger(__name__)
         
-        # Default configuration
-        self.default_config = {
+        # Default configuration (read-only; loaded configs layer on top of it)
+        self.default_config = MappingProxyType({
             "port_a": "/dev/ttyUSB0",
             "port_b": "/dev/ttyUSB1",
             "baud_rate": 9600,
@@ -49,28 +90,44 @@ class ConfigManager:
             "buffer_size": 4096,
             "max_message_size": 1024,
             "message_timeout": 1.0
-        }
+        })
+        
+        # Defaults that can be changed in place; each loaded config gets its own copy
+        self._mutable_defaults = tuple(key for key, value in self.default_config.items()
+                                       if isinstance(value, (list, dict)))
 
-    def load_config(self) -> Dict[str, Any]:
-        """Load configuration from file"""
+    def load_config(self) -> MutableMapping[str, Any]:
+        """Load configuration from file
+        
+        The result is a ChainMap layering the loaded values over the defaults,
+        so every key is present without copying the default table. Writes go
+        to the loaded layer only, and mutable defaults such as the spoofing
+        rules list are copied into it so callers never share them.
+        """
         try:
             if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    config = json.load(f)
+                with open(self.config_file, 'rb') as f:
+                    config = _json_loads(f.read())
                 
-                # Merge with defaults to ensure all keys exist
-                merged_config = self.default_config.copy()
-                merged_config.update(config)
+                if not isinstance(config, dict):
+                    raise ValueError("configuration root must be an object")
                 
                 self.logger.info(f"Configuration loaded from {self.config_file}")
-                return merged_config
+                return self._layer_over_defaults(config)
             else:
                 self.logger.info("No config file found, using defaults")
-                return self.default_config.copy()
+                return self._layer_over_defaults({})
                 
         except Exception as e:
             self.logger.error(f"Error loading config: {e}")
-            return self.default_config.copy()
+            return self._layer_over_defaults({})
+
+    def _layer_over_defaults(self, config: Dict[str, Any]) -> MutableMapping[str, Any]:
+        """Layer config over the defaults, copying in any mutable default it lacks"""
+        for key in self._mutable_defaults:
+            if key not in config:
+                config[key] = copy.deepcopy(self.default_config[key])
+        return ChainMap(config, self.default_config)
 
     def save_config(self, config: Dict[str, Any]) -> bool:
         """Save configuration to file"""
@@ -78,8 +135,8 @@ class ConfigManager:
             # Validate configuration
             validated_config = self.validate_config(config)
             
-            with open(self.config_file, 'w') as f:
-                json.dump(validated_config, f, indent=2)
+            with open(self.config_file, 'wb') as f:
+                f.write(_json_dumps(validated_config))
             
             self.logger.info(f"Configuration saved to {self.config_file}")
             return True
@@ -90,38 +147,24 @@ class ConfigManager:
 
     def validate_config(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """Validate and sanitize configuration values"""
-        validated = config.copy()
-        
-        # Validate baud rate
-        valid_baud_rates = [300, 600, 1200, 2400, 4800, 9600, 19200, 38400, 57600, 115200]
-        if validated.get('baud_rate') not in valid_baud_rates:
-            validated['baud_rate'] = 9600
-        
-        # Validate data bits
-        if validated.get('data_bits') not in [5, 6, 7, 8]:
-            validated['data_bits'] = 8
+        # Materialize a plain dict (config may be a ChainMap from load_config)
+        validated = dict(config)
         
-        # Validate parity
-        if validated.get('parity') not in ['none', 'even', 'odd', 'mark', 'space']:
-            validated['parity'] = 'none'
-        
-        # Validate stop bits
-        if validated.get('stop_bits') not in [1, 1.5, 2]:
-            validated['stop_bits'] = 1
+        # Validate enumerated settings (baud rate, data bits, parity, ...)
+        for key, allowed, default in _ENUM_RULES:
+            try:
+                valid = validated.get(key) in allowed
+            except TypeError:
+                # Unhashable values (lists, dicts) can never be valid
+                valid = False
+            if not valid:
+                validated[key] = default
         
         # Validate timeout
         timeout = validated.get('timeout', 1.0)
         if not isinstance(timeout, (int, float)) or timeout <= 0:
             validated['timeout'] = 1.0
         
-        # Validate log format
-        if validated.get('log_format') not in ['ascii', 'hex', 'both']:
-            validated['log_format'] = 'both'
-        
-        # Validate theme
-        if validated.get('theme') not in ['light', 'dark']:
-            validated['theme'] = 'light'
-        
         # Ensure spoofing_rules is a list
         if not isinstance(validated.get('spoofing_rules'), list):
             validated['spoofing_rules'] = []
@@ -145,21 +188,13 @@ class ConfigManager:
 
     def _get_parity_constant(self, parity_str: str):
         """Convert parity string to pyserial constant"""
-        import serial
-        parity_map = {
-            'none': serial.PARITY_NONE,
-            'even': serial.PARITY_EVEN,
-            'odd': serial.PARITY_ODD,
-            'mark': serial.PARITY_MARK,
-            'space': serial.PARITY_SPACE
-        }
-        return parity_map.get(parity_str, serial.PARITY_NONE)
+        return _PARITY_MAP.get(parity_str, serial.PARITY_NONE)
 
     def export_config(self, filename: str, config: Dict[str, Any]) -> bool:
         """Export configuration to specified file"""
         try:
-            with open(filename, 'w') as f:
-                json.dump(config, f, indent=2)
+            with open(filename, 'wb') as f:
+                f.write(_json_dumps(dict(config)))
             return True
         except Exception as e:
             self.logger.error(f"Error exporting config: {e}")
@@ -168,8 +203,8 @@ class ConfigManager:
     def import_config(self, filename: str) -> Optional[Dict[str, Any]]:
         """Import configuration from specified file"""
         try:
-            with open(filename, 'r') as f:
-                config = json.load(f)
+            with open(filename, 'rb') as f:
+                config = _json_loads(f.read())
             return self.validate_config(config)
         except Exception as e:
             self.logger.error(f"Error importing config: {e}")
@@ -4,39 +4,113 @@ Handles CSV logging, data formatting, and log management
 """
 
 import csv
+import io
 import os
+import re
+import shutil
+import sys
+import time
 from datetime import datetime, date
-from typing import Optional, List, Dict, Any
+from queue import Queue, Empty, Full
+from typing import Optional, List, Dict, Any, Union
 import logging
 import threading
 
+# Any buffer accepted for logged data; formatting never copies it to bytes
+BytesLike = Union[bytes, bytearray, memoryview]
+
+# Rows are buffered and written out in batches to avoid a flush per message
+BATCH_ROWS = 64
+BATCH_INTERVAL = 0.05  # seconds
+
+# Messages waiting for the writer thread; further messages are dropped when full
+LOG_QUEUE_SIZE = 10000
+
+# How long flush() and close() wait on the writer thread before giving up
+WRITER_TIMEOUT = 5.0  # seconds
+
+# Non-printable bytes are rendered as \xNN escapes in ASCII columns
+_ASCII_ESCAPES = {b: f'\\x{b:02x}' for b in range(256) if not 32 <= b <= 126}
+
+# Timestamps are formatted to the second and milliseconds appended
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Shared values for the Spoofed column
+_YES = sys.intern('Yes')
+_NO = sys.intern('No')
+
+# Protocol, Valid, Description, Error (placeholders for now)
+_PROTOCOL_TRAILER = ('', '', '', '')
+
+# Every log file uses the same columns; the data pair not selected by the
+# log format is left empty so the schema is stable across configurations
+CSV_HEADER = ('Timestamp', 'Direction', 'Length', 'Spoofed',
+              'Original_ASCII', 'Modified_ASCII', 'Original_HEX', 'Modified_HEX',
+              'Protocol', 'Valid', 'Description', 'Error')
+_EMPTY_PAIR = ['', '']
+
+def _is_unmodified(data: BytesLike, modified_data: Optional[BytesLike]) -> bool:
+    """True when the modified columns can reuse the original's formatting"""
+    return not modified_data or modified_data is data or modified_data == data
+
+# Fields containing any of these must be quoted (csv.QUOTE_MINIMAL rules)
+_CSV_SPECIAL = re.compile(r'[",\r\n]')
+
+def _encode_rows(rows) -> bytes:
+    """Serialize rows to UTF-8 CSV bytes, matching csv.writer's default dialect"""
+    lines = []
+    for row in rows:
+        lines.append(','.join(
+            '"' + field.replace('"', '""') + '"' if _CSV_SPECIAL.search(field) else field
+            for field in row
+        ))
+        lines.append('\r\n')
+    return ''.join(lines).encode('utf-8')
+
+# Encoded header line, also used to recognize files written with other layouts
+_CSV_HEADER_LINE = _encode_rows([CSV_HEADER])
+
 class DataLogger:
     def __init__(self):
         self.log_folder = "./logs"
         self.log_format = "both"  # ascii, hex, both
         self.max_log_files = 30
+        self._update_format_flags()
         
         self.current_log_file = None
         self.current_date = None
-        self.csv_writer = None
         self.log_file_handle = None
         
+        # (year, month, day) of the open log file, compared on every row
+        self._current_ymd = None
+        
         self.logger = logging.getLogger(__name__)
         self.lock = threading.Lock()
         
-        # Statistics
-        self.stats = {
-            'total_messages': 0,
-            'total_bytes': 0,
-            'spoofed_messages': 0,
-            'start_time': datetime.now()
-        }
+        # Pending rows not yet written to the current log file
+        self._row_buffer: List[List[str]] = []
+        self._last_flush = time.monotonic()
+        
+        # Last whole second formatted for the Timestamp column
+        self._ts_second = None
+        self._ts_prefix = ''
+        
+        # Messages handed off by log_data to the background writer thread
+        self._queue = Queue(maxsize=LOG_QUEUE_SIZE)
+        self._writer_thread = None
+        
+        # Statistics are plain ints updated without locking: the totals by the
+        # writer thread, the drop count by the serial threads. The GUI thread
+        # reads and resets them concurrently, so a reading may be momentarily
+        # stale and a reset can race with an update; they are display counters.
+        self.reset_statistics()
 
     def configure(self, log_folder: str, log_format: str, max_log_files: int = 30):
         """Configure logger settings"""
         self.log_folder = log_folder
         self.log_format = log_format
         self.max_log_files = max_log_files
+        self._update_format_flags()
         
         # Create log folder if it doesn't exist
         os.makedirs(self.log_folder, exist_ok=True)
@@ -44,53 +118,196 @@ class DataLogger:
         # Clean up old log files
         self._cleanup_old_logs()
 
-    def log_data(self, data: bytes, direction: str, timestamp: datetime, 
-                 modified_data: Optional[bytes] = None, spoofed: bool = False):
-        """Log communication data"""
+    def _update_format_flags(self):
+        """Precompute which data columns the current log format emits"""
+        self._emit_ascii = self.log_format in ('ascii', 'both')
+        self._emit_hex = self.log_format in ('hex', 'both')
+        
+        # Bind the column builder for this format so rows skip the checks
+        if self._emit_ascii and self._emit_hex:
+            self._data_columns = self._ascii_hex_columns
+        elif self._emit_ascii:
+            self._data_columns = self._ascii_columns
+        elif self._emit_hex:
+            self._data_columns = self._hex_columns
+        else:
+            self._data_columns = self._no_columns
+
+    def log_data(self, data: BytesLike, direction: str, timestamp: datetime, 
+                 modified_data: Optional[BytesLike] = None, spoofed: bool = False):
+        """Queue communication data for logging
+        
+        Formatting and disk writes happen on a background writer thread so
+        the serial threads never wait on the disk. If the queue is full the
+        message is dropped and counted in the statistics.
+        
+        Data may be bytes, bytearray or memoryview and is queued without
+        copying, so callers must not pass views over buffers they reuse.
+        """
+        if self._writer_thread is None:
+            self._start_writer()
+        
+        try:
+            self._queue.put_nowait((data, direction, timestamp, modified_data, spoofed))
+        except Full:
+            self._dropped_messages += 1
+
+    def _start_writer(self):
+        """Start the background writer thread if it is not running"""
         with self.lock:
+            if self._writer_thread is None:
+                self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+                self._writer_thread.start()
+
+    def _writer_loop(self):
+        """Drain the message queue, writing rows to the current log file"""
+        while True:
             try:
-                # Check if we need a new log file (new day)
-                current_date = timestamp.date()
-                if current_date != self.current_date:
-                    self._create_new_log_file(current_date)
-                
-                # Prepare log entry
-                log_entry = self._prepare_log_entry(data, direction, timestamp, modified_data, spoofed)
-                
-                # Write to CSV
-                if self.csv_writer:
-                    self.csv_writer.writerow(log_entry)
-                    self.log_file_handle.flush()
-                
-                # Update statistics
-                self.stats['total_messages'] += 1
-                self.stats['total_bytes'] += len(data)
+                item = self._queue.get(timeout=BATCH_INTERVAL)
+            except Empty:
+                # Idle: write out whatever is still buffered
+                with self.lock:
+                    if self._row_buffer:
+                        self._flush_buffer()
+                continue
+            
+            # Take everything else already queued (up to one batch) so a
+            # burst is formatted under one lock acquisition and one write.
+            # None (stop) and an Event (flush request) end the batch.
+            items = [item]
+            while item is not None and not isinstance(item, threading.Event) and len(items) < BATCH_ROWS:
+                try:
+                    item = self._queue.get_nowait()
+                except Empty:
+                    break
+                items.append(item)
+            
+            control = items[-1]
+            is_control = control is None or isinstance(control, threading.Event)
+            if is_control:
+                items.pop()
+            
+            try:
+                self._write_batch(items, force_flush=is_control)
+            finally:
+                if is_control and control is not None:
+                    control.set()
+            
+            if is_control and control is None:
+                return
+
+    def _write_batch(self, items: List[tuple], force_flush: bool = False):
+        """Format queued messages and add them to the row buffer"""
+        messages = 0
+        total_bytes = 0
+        spoofed_messages = 0
+        
+        # Formatting only touches writer-thread state, so it runs unlocked
+        rows = []
+        for data, direction, timestamp, modified_data, spoofed in items:
+            try:
+                ymd = (timestamp.year, timestamp.month, timestamp.day)
+                rows.append((ymd, self._prepare_log_entry(data, direction, timestamp,
+                                                          modified_data, spoofed)))
+                messages += 1
+                total_bytes += len(data)
                 if spoofed:
-                    self.stats['spoofed_messages'] += 1
-                
+                    spoofed_messages += 1
             except Exception as e:
                 self.logger.error(f"Error logging data: {e}")
+        
+        with self.lock:
+            for ymd, log_entry in rows:
+                # Check if we need a new log file (new day)
+                if ymd != self._current_ymd:
+                    self._create_new_log_file(date(*ymd))
+                self._row_buffer.append(log_entry)
+            
+            # Write out once the batch is full or stale
+            if (force_flush or len(self._row_buffer) >= BATCH_ROWS or
+                    time.monotonic() - self._last_flush >= BATCH_INTERVAL):
+                self._flush_buffer()
+        
+        # Update statistics once per batch
+        self._total_messages += messages
+        self._total_bytes += total_bytes
+        self._spoofed_messages += spoofed_messages
+
+    def _flush_buffer(self):
+        """Write buffered rows to the current log file in a single call"""
+        self._last_flush = time.monotonic()
+        
+        if not self._row_buffer:
+            return
+        
+        rows = self._row_buffer
+        self._row_buffer = []
+        
+        if not self.log_file_handle:
+            return
+        
+        try:
+            self.log_file_handle.write(_encode_rows(rows))
+            self.log_file_handle.flush()
+        except Exception as e:
+            self.logger.error(f"Error writing log rows: {e}")
+
+    def flush(self):
+        """Write all queued and buffered rows to disk"""
+        writer = self._writer_thread
+        if writer is not None and writer.is_alive():
+            # The writer sets the event once everything queued before it is
+            # written; messages queued afterwards don't hold up the flush
+            done = threading.Event()
+            try:
+                self._queue.put(done, timeout=WRITER_TIMEOUT)
+                flushed = done.wait(WRITER_TIMEOUT)
+            except Full:
+                flushed = False
+            if not flushed:
+                self.logger.warning("Log writer did not flush in time; some rows may be missing")
+        with self.lock:
+            self._flush_buffer()
 
     def _create_new_log_file(self, log_date: date):
         """Create a new log file for the given date"""
         try:
             # Close current file if open
             if self.log_file_handle:
+                self._flush_buffer()
                 self.log_file_handle.close()
             
-            # Create new file
-            filename = f"rs232_log_{log_date.strftime('%Y%m%d')}.csv"
-            filepath = os.path.join(self.log_folder, filename)
-            
-            self.log_file_handle = open(filepath, 'a', newline='', encoding='utf-8')
-            self.csv_writer = csv.writer(self.log_file_handle)
+            # Create new file. A day file written with a different column
+            # layout isn't appended to; rows go to the next numbered file.
+            base = f"rs232_log_{log_date.strftime('%Y%m%d')}"
+            suffix = 0
+            while True:
+                filepath = os.path.join(self.log_folder, f"{base}_{suffix}.csv" if suffix else f"{base}.csv")
+                
+                # Exclusive create tells us whether the file is new without a
+                # separate stat; rows are batched already, so no buffering.
+                flags = os.O_WRONLY | os.O_APPEND
+                try:
+                    fd = os.open(filepath, flags | os.O_CREAT | os.O_EXCL, 0o644)
+                    is_new = True
+                except FileExistsError:
+                    fd = os.open(filepath, flags)
+                    # An existing but empty file (e.g. left by a crash) still needs a header
+                    is_new = os.fstat(fd).st_size == 0
+                
+                if is_new or self._read_header_line(filepath) == _CSV_HEADER_LINE:
+                    break
+                os.close(fd)
+                suffix += 1
+            self.log_file_handle = os.fdopen(fd, 'ab', buffering=0)
             
-            # Write header if file is new
-            if os.path.getsize(filepath) == 0:
+            # Write header if file is new or empty
+            if is_new:
                 self._write_csv_header()
             
             self.current_log_file = filepath
             self.current_date = log_date
+            self._current_ymd = (log_date.year, log_date.month, log_date.day)
             
             self.logger.info(f"Created new log file: {filepath}")
             
@@ -99,61 +316,83 @@ class DataLogger:
 
     def _write_csv_header(self):
         """Write CSV header row"""
-        header = ['Timestamp', 'Direction', 'Length', 'Spoofed']
-        
-        if self.log_format in ['ascii', 'both']:
-            header.extend(['Original_ASCII', 'Modified_ASCII'])
-        
-        if self.log_format in ['hex', 'both']:
-            header.extend(['Original_HEX', 'Modified_HEX'])
-        
-        header.extend(['Protocol', 'Valid', 'Description', 'Error'])
-        
-        self.csv_writer.writerow(header)
+        self.log_file_handle.write(_CSV_HEADER_LINE)
+
+    def _read_header_line(self, filepath: str) -> bytes:
+        """First line of a log file, including its line ending"""
+        with open(filepath, 'rb') as f:
+            return f.readline()
 
-    def _prepare_log_entry(self, data: bytes, direction: str, timestamp: datetime,
-                          modified_data: Optional[bytes], spoofed: bool) -> List[str]:
+    def _prepare_log_entry(self, data: BytesLike, direction: str, timestamp: datetime,
+                          modified_data: Optional[BytesLike], spoofed: bool) -> List[str]:
         """Prepare a log entry for CSV writing"""
+        # Messages arrive in bursts, so only reformat when the second changes
+        second = timestamp.replace(microsecond=0)
+        if second != self._ts_second:
+            self._ts_second = second
+            self._ts_prefix = timestamp.strftime(TIMESTAMP_FORMAT)
+        
         entry = [
-            timestamp.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3],
+            f"{self._ts_prefix}.{timestamp.microsecond // 1000:03d}",
             direction,
             str(len(data)),
-            'Yes' if spoofed else 'No'
+            _YES if spoofed else _NO
         ]
         
-        # Add ASCII data if requested
-        if self.log_format in ['ascii', 'both']:
-            original_ascii = self._bytes_to_ascii(data)
-            modified_ascii = self._bytes_to_ascii(modified_data) if modified_data else original_ascii
-            entry.extend([original_ascii, modified_ascii])
-        
-        # Add HEX data if requested
-        if self.log_format in ['hex', 'both']:
-            original_hex = self._bytes_to_hex(data)
-            modified_hex = self._bytes_to_hex(modified_data) if modified_data else original_hex
-            entry.extend([original_hex, modified_hex])
+        # Add ASCII/HEX data for the configured format
+        entry.extend(self._data_columns(data, modified_data))
         
-        # Add protocol information (placeholders for now)
-        entry.extend(['', '', '', ''])  # Protocol, Valid, Description, Error
+        # Add protocol information
+        entry.extend(_PROTOCOL_TRAILER)
         
         return entry
 
-    def _bytes_to_ascii(self, data: bytes) -> str:
+    def _ascii_pair(self, data: BytesLike, modified_data: Optional[BytesLike]) -> List[str]:
+        """Original and modified ASCII values"""
+        original_ascii = self._bytes_to_ascii(data)
+        if _is_unmodified(data, modified_data):
+            return [original_ascii, original_ascii]
+        return [original_ascii, self._bytes_to_ascii(modified_data)]
+
+    def _hex_pair(self, data: BytesLike, modified_data: Optional[BytesLike]) -> List[str]:
+        """Original and modified HEX values"""
+        original_hex = self._bytes_to_hex(data)
+        if _is_unmodified(data, modified_data):
+            return [original_hex, original_hex]
+        return [original_hex, self._bytes_to_hex(modified_data)]
+
+    def _ascii_columns(self, data: BytesLike, modified_data: Optional[BytesLike]) -> List[str]:
+        """Data columns for the 'ascii' format"""
+        return self._ascii_pair(data, modified_data) + _EMPTY_PAIR
+
+    def _hex_columns(self, data: BytesLike, modified_data: Optional[BytesLike]) -> List[str]:
+        """Data columns for the 'hex' format"""
+        return _EMPTY_PAIR + self._hex_pair(data, modified_data)
+
+    def _ascii_hex_columns(self, data: BytesLike, modified_data: Optional[BytesLike]) -> List[str]:
+        """Data columns for the 'both' format"""
+        return self._ascii_pair(data, modified_data) + self._hex_pair(data, modified_data)
+
+    def _no_columns(self, data: BytesLike, modified_data: Optional[BytesLike]) -> List[str]:
+        """Data columns for an unrecognized log format"""
+        return _EMPTY_PAIR + _EMPTY_PAIR
+
+    def _bytes_to_ascii(self, data: BytesLike) -> str:
         """Convert bytes to ASCII representation"""
         if not data:
             return ""
         
         try:
-            # Try to decode as ASCII, replace non-printable characters
-            return ''.join(chr(b) if 32 <= b <= 126 else f'\\x{b:02x}' for b in data)
+            # latin-1 maps each byte to one code point; escape non-printables
+            return str(data, 'latin-1').translate(_ASCII_ESCAPES)
         except:
             return f"<decode_error:{len(data)}_bytes>"
 
-    def _bytes_to_hex(self, data: bytes) -> str:
+    def _bytes_to_hex(self, data: BytesLike) -> str:
         """Convert bytes to hexadecimal representation"""
         if not data:
             return ""
-        return ' '.join(f'{b:02X}' for b in data)
+        return data.hex(' ').upper()
 
     def _cleanup_old_logs(self):
         """Remove old log files beyond the retention limit"""
@@ -161,13 +400,10 @@ class DataLogger:
             if not os.path.exists(self.log_folder):
                 return
             
-            # Get all log files
-            log_files = []
-            for filename in os.listdir(self.log_folder):
-                if filename.startswith('rs232_log_') and filename.endswith('.csv'):
-                    filepath = os.path.join(self.log_folder, filename)
-                    mtime = os.path.getmtime(filepath)
-                    log_files.append((filepath, mtime))
+            # Get all log files (DirEntry caches stat data where the OS allows)
+            with os.scandir(self.log_folder) as entries:
+                log_files = [(entry.path, entry.stat().st_mtime) for entry in entries
+                             if entry.name.startswith('rs232_log_') and entry.name.endswith('.csv')]
             
             # Sort by modification time (newest first)
             log_files.sort(key=lambda x: x[1], reverse=True)
@@ -186,24 +422,28 @@ class DataLogger:
     def export_logs(self, filename: str, start_date: Optional[date] = None, 
                    end_date: Optional[date] = None) -> bool:
         """Export logs to a single file"""
+        # Make sure rows still held in memory are part of the export
+        self.flush()
+        
         try:
-            with open(filename, 'w', newline='', encoding='utf-8') as outfile:
-                writer = csv.writer(outfile)
-                
+            with open(filename, 'wb') as outfile:
                 # Write header
-                self._write_export_header(writer)
+                outfile.write(_CSV_HEADER_LINE)
                 
                 # Get log files in date range
                 log_files = self._get_log_files_in_range(start_date, end_date)
                 
-                # Copy data from each log file
+                # Copy data from each log file. Files with the current header
+                # are streamed as raw bytes rather than re-parsed through the
+                # csv module; older layouts are mapped onto CSV_HEADER.
                 for log_file in log_files:
                     try:
-                        with open(log_file, 'r', encoding='utf-8') as infile:
-                            reader = csv.reader(infile)
-                            next(reader, None)  # Skip header
-                            for row in reader:
-                                writer.writerow(row)
+                        with open(log_file, 'rb') as infile:
+                            header = infile.readline()
+                            if header == _CSV_HEADER_LINE:
+                                shutil.copyfileobj(infile, outfile, 1 << 20)
+                            elif header:
+                                self._export_legacy_rows(header, infile, outfile)
                     except Exception as e:
                         self.logger.warning(f"Error reading log file {log_file}: {e}")
             
@@ -214,18 +454,16 @@ class DataLogger:
             self.logger.error(f"Error exporting logs: {e}")
             return False
 
-    def _write_export_header(self, writer):
-        """Write header for exported logs"""
-        header = ['Timestamp', 'Direction', 'Length', 'Spoofed']
-        
-        if self.log_format in ['ascii', 'both']:
-            header.extend(['Original_ASCII', 'Modified_ASCII'])
-        
-        if self.log_format in ['hex', 'both']:
-            header.extend(['Original_HEX', 'Modified_HEX'])
+    def _export_legacy_rows(self, header: bytes, infile, outfile):
+        """Copy rows of a file with an older column layout, aligned to CSV_HEADER"""
+        columns = next(csv.reader([header.decode('utf-8')]))
+        positions = [columns.index(name) if name in columns else None for name in CSV_HEADER]
         
-        header.extend(['Protocol', 'Valid', 'Description', 'Error'])
-        writer.writerow(header)
+        rows = csv.reader(io.TextIOWrapper(infile, encoding='utf-8', newline=''))
+        outfile.write(_encode_rows(
+            [row[i] if i is not None and i < len(row) else '' for i in positions]
+            for row in rows
+        ))
 
     def _get_log_files_in_range(self, start_date: Optional[date], 
                                end_date: Optional[date]) -> List[str]:
@@ -235,8 +473,12 @@ class DataLogger:
         if not os.path.exists(self.log_folder):
             return log_files
         
-        for filename in os.listdir(self.log_folder):
-            if filename.startswith('rs232_log_') and filename.endswith('.csv'):
+        with os.scandir(self.log_folder) as entries:
+            for entry in entries:
+                filename = entry.name
+                if not (filename.startswith('rs232_log_') and filename.endswith('.csv')):
+                    continue
+                
                 try:
                     # Extract date from filename
                     date_str = filename[10:18]  # rs232_log_YYYYMMDD.csv
@@ -248,7 +490,7 @@ class DataLogger:
                     if end_date and file_date > end_date:
                         continue
                     
-                    log_files.append(os.path.join(self.log_folder, filename))
+                    log_files.append(entry.path)
                     
                 except ValueError:
                     # Invalid date format, skip
@@ -258,32 +500,46 @@ class DataLogger:
 
     def get_statistics(self) -> Dict[str, Any]:
         """Get logging statistics"""
-        runtime = datetime.now() - self.stats['start_time']
+        runtime = datetime.now() - self._start_time
+        total_messages = self._total_messages
+        total_bytes = self._total_bytes
+        spoofed_messages = self._spoofed_messages
         
         return {
-            'total_messages': self.stats['total_messages'],
-            'total_bytes': self.stats['total_bytes'],
-            'spoofed_messages': self.stats['spoofed_messages'],
-            'spoofed_percentage': (self.stats['spoofed_messages'] / max(self.stats['total_messages'], 1)) * 100,
+            'total_messages': total_messages,
+            'total_bytes': total_bytes,
+            'spoofed_messages': spoofed_messages,
+            'spoofed_percentage': (spoofed_messages / max(total_messages, 1)) * 100,
+            'dropped_messages': self._dropped_messages,
             'runtime_seconds': runtime.total_seconds(),
-            'messages_per_second': self.stats['total_messages'] / max(runtime.total_seconds(), 1),
-            'bytes_per_second': self.stats['total_bytes'] / max(runtime.total_seconds(), 1),
+            'messages_per_second': total_messages / max(runtime.total_seconds(), 1),
+            'bytes_per_second': total_bytes / max(runtime.total_seconds(), 1),
             'current_log_file': self.current_log_file
         }
 
     def reset_statistics(self):
         """Reset logging statistics"""
-        self.stats = {
-            'total_messages': 0,
-            'total_bytes': 0,
-            'spoofed_messages': 0,
-            'start_time': datetime.now()
-        }
+        self._total_messages = 0
+        self._total_bytes = 0
+        self._spoofed_messages = 0
+        self._dropped_messages = 0
+        self._start_time = datetime.now()
 
     def close(self):
-        """Close the logger and any open files"""
+        """Stop the writer thread and close any open files"""
+        writer = self._writer_thread
+        if writer is not None:
+            try:
+                self._queue.put(None, timeout=WRITER_TIMEOUT)
+            except Full:
+                # The writer is stuck or gone; drop whatever is still queued
+                self.logger.warning("Log queue full at shutdown; dropping queued messages")
+            else:
+                writer.join(timeout=WRITER_TIMEOUT)
+            self._writer_thread = None
+        
         with self.lock:
             if self.log_file_handle:
+                self._flush_buffer()
                 self.log_file_handle.close()
                 self.log_file_handle = None
-                self.csv_writer = None
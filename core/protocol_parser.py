@@ -5,10 +5,53 @@ Supports Modbus RTU/ASCII, NMEA, and custom protocols
 
 import struct
 import re
+import time
+from binascii import unhexlify, Error as BinasciiError
+from array import array
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Any
 from enum import Enum
 
+# crcmod's C extension is optional; the pure Python CRC is used without it
+try:
+    import crcmod.predefined
+    _modbus_crc_fast = crcmod.predefined.mkPredefinedCrcFun('modbus')
+except ImportError:
+    _modbus_crc_fast = None
+
+def _build_crc16_table() -> array:
+    """Build the byte-wise lookup table for the reflected 0xA001 polynomial"""
+    table = array('H')
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            if crc & 1:
+                crc = (crc >> 1) ^ 0xA001
+            else:
+                crc >>= 1
+        table.append(crc)
+    return table
+
+_CRC16_TABLE = _build_crc16_table()
+
+# Precompiled 16-bit field decoders (CRC is little-endian, registers big-endian)
+_U16LE = struct.Struct('<H')
+_U16BE = struct.Struct('>H')
+_u16le_from = _U16LE.unpack_from
+_u16be_from = _U16BE.unpack_from
+
+def _xor_checksum(data: bytes) -> int:
+    """XOR of all bytes, folded as one big integer instead of per byte"""
+    value = int.from_bytes(data, 'little')
+    width = len(data)
+    while width > 1:
+        # XOR the upper bytes onto the lower half, halving the width each step
+        half = (width + 1) // 2
+        shift = half * 8
+        value = (value & ((1 << shift) - 1)) ^ (value >> shift)
+        width = half
+    return value
+
 class ProtocolType(Enum):
     RAW = "Raw"
     MODBUS_RTU = "Modbus RTU"
@@ -17,15 +60,155 @@ class ProtocolType(Enum):
     ASCII_DELIMITED = "ASCII Delimited"
     CUSTOM_BINARY = "Custom Binary"
 
+# Protocol detection: all ASCII signatures in one alternation so a frame is
+# tested with a single match; the group that matched identifies the protocol
+_ASCII_SIGNATURES = re.compile(
+    rb'^(?:'
+    rb'(:[0-9A-Fa-f]+\r\n)'                                   # Modbus ASCII
+    rb'|(\$[A-Z]{2}[A-Z0-9]{3},[^*]*\*[0-9A-Fa-f]{2}\r\n)'   # NMEA 0183
+    rb')$'
+)
+_SIGNATURE_PROTOCOLS = (None, ProtocolType.MODBUS_ASCII, ProtocolType.NMEA)
+
+# Lookup tables for dumps: printable ASCII or '.', and 8-bit binary strings
+_PRINTABLE_OR_DOT = bytes(b if 32 <= b <= 126 else 0x2E for b in range(256))
+_BINARY_STRINGS = tuple(f'{b:08b}' for b in range(256))
+
+# Modbus function codes accepted by RTU detection, one bit per code
+_VALID_FC_MASK = sum(1 << code for code in (1, 2, 3, 4, 5, 6, 15, 16, 23))
+
+def _render_hex_dump(data: bytes) -> str:
+    """Space-separated uppercase hex bytes"""
+    return data.hex(' ').upper()
+
+def _render_ascii_repr(data: bytes) -> str:
+    """Printable ASCII with '.' for everything else"""
+    return data.translate(_PRINTABLE_OR_DOT).decode('ascii')
+
+def _render_offset_dump(data: bytes, ascii_str: str) -> str:
+    """Offset, hex and ASCII columns, 16 bytes per line"""
+    hex_str = data.hex(' ').upper()
+    return ''.join([f"{i:04X}: {hex_str[3 * i:3 * i + 47]:<48} |{ascii_str[i:i + 16]}|\n"
+                    for i in range(0, len(data), 16)])
+
+def _render_binary_repr(data: bytes) -> str:
+    """Space-separated 8-bit binary strings"""
+    return ' '.join([_BINARY_STRINGS[b] for b in data])
+
+class _LazyFields(dict):
+    """parsed_data dict whose byte dumps are rendered on first access"""
+    __slots__ = ('_data', '_renderers')
+
+    def __init__(self, data: bytes, fields: Dict[str, Any],
+                 renderers: Dict[str, Callable[[bytes], str]]):
+        super().__init__(fields)
+        self._data = data
+        self._renderers = renderers
+
+    def __missing__(self, key: str) -> Any:
+        value = self._renderers[key](self._data)
+        self[key] = value
+        return value
+
+    def _render_all(self):
+        """Render every pending dump so whole-dict reads see all the fields"""
+        if self._renderers:
+            for key in self._renderers:
+                if not dict.__contains__(self, key):
+                    self[key] = self._renderers[key](self._data)
+            self._renderers = {}
+
+    def __contains__(self, key) -> bool:
+        return key in self._renderers or dict.__contains__(self, key)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def __iter__(self) -> Iterator[str]:
+        self._render_all()
+        return dict.__iter__(self)
+
+    def __len__(self) -> int:
+        self._render_all()
+        return dict.__len__(self)
+
+    def __eq__(self, other) -> bool:
+        self._render_all()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other) -> bool:
+        self._render_all()
+        return dict.__ne__(self, other)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        self._render_all()
+        return dict.__repr__(self)
+
+    def keys(self):
+        self._render_all()
+        return dict.keys(self)
+
+    def values(self):
+        self._render_all()
+        return dict.values(self)
+
+    def items(self):
+        self._render_all()
+        return dict.items(self)
+
+    def copy(self) -> Dict[str, Any]:
+        self._render_all()
+        return dict(dict.items(self))
+
+_CUSTOM_BINARY_RENDERERS = {'hex_dump': _render_hex_dump, 'ascii_repr': _render_ascii_repr}
+_RAW_RENDERERS = {'hex_dump': _render_hex_dump, 'binary_repr': _render_binary_repr}
+
+# Position of each protocol in the statistics counter arrays
+_PROTOCOL_INDEX = {protocol: index for index, protocol in enumerate(ProtocolType)}
+
 class ParsedMessage:
     def __init__(self, protocol: ProtocolType, raw_data: bytes, timestamp: datetime = None):
         self.protocol = protocol
         self.raw_data = raw_data
-        self.timestamp = timestamp or datetime.now()
+        # Wall-clock nanoseconds; the datetime is only built if someone asks
+        self._ts_ns = time.time_ns()
+        self._timestamp = timestamp
         self.parsed_data = {}
         self.is_valid = False
         self.error_message = ""
         self.description = ""
+        self._hex_dump = None
+        self._printable_text = None
+        self._timestamp_str = None
+
+    @property
+    def timestamp(self) -> datetime:
+        if self._timestamp is None:
+            self._timestamp = datetime.fromtimestamp(self._ts_ns / 1e9)
+        return self._timestamp
+
+    @property
+    def timestamp_str(self) -> str:
+        """'YYYY-MM-DD HH:MM:SS.mmm' timestamp, formatted on first use"""
+        if self._timestamp_str is None:
+            self._timestamp_str = self.timestamp.isoformat(sep=' ', timespec='milliseconds')
+        return self._timestamp_str
+
+    @property
+    def printable_text(self) -> str:
+        """Raw data as printable ASCII with '.' for other bytes, built on first use"""
+        if self._printable_text is None:
+            self._printable_text = _render_ascii_repr(bytes(self.raw_data))
+        return self._printable_text
+
+    @property
+    def hex_dump(self) -> str:
+        """Offset/hex/ASCII dump of the raw data, built on first use"""
+        if self._hex_dump is None:
+            self._hex_dump = _render_offset_dump(bytes(self.raw_data), self.printable_text)
+        return self._hex_dump
 
 class ProtocolParser:
     def __init__(self):
@@ -38,18 +221,20 @@ class ProtocolParser:
             ProtocolType.RAW: self._parse_raw
         }
         
-        # Protocol detection patterns
-        self.detection_patterns = {
-            ProtocolType.MODBUS_ASCII: re.compile(rb'^:[0-9A-Fa-f]+\r\n$'),
-            ProtocolType.NMEA: re.compile(rb'^\$[A-Z]{2}[A-Z0-9]{3},[^*]*\*[0-9A-Fa-f]{2}\r\n$'),
+        # Function-specific Modbus RTU field parsers
+        self._fc_handlers = {
+            1: self._fc_read_bits,
+            2: self._fc_read_bits,
+            3: self._fc_read_regs,
+            4: self._fc_read_regs
         }
 
     def auto_detect_protocol(self, data: bytes) -> ProtocolType:
         """Auto-detect protocol based on data patterns"""
         # Check ASCII-based protocols first
-        for protocol, pattern in self.detection_patterns.items():
-            if pattern.match(data):
-                return protocol
+        match = _ASCII_SIGNATURES.match(data)
+        if match:
+            return _SIGNATURE_PROTOCOLS[match.lastindex]
         
         # Check Modbus RTU (binary, minimum 4 bytes)
         if len(data) >= 4 and self._is_likely_modbus_rtu(data):
@@ -93,9 +278,7 @@ class ProtocolParser:
             return False
         
         # Check if second byte is valid function code
-        func_code = data[1]
-        valid_func_codes = [1, 2, 3, 4, 5, 6, 15, 16, 23]
-        if func_code not in valid_func_codes:
+        if not (_VALID_FC_MASK >> data[1]) & 1:
             return False
         
         return True
@@ -110,10 +293,10 @@ class ProtocolParser:
         slave_addr = data[0]
         func_code = data[1]
         
-        # Calculate and verify CRC
-        msg_data = data[:-2]
-        received_crc = struct.unpack('<H', data[-2:])[0]
-        calculated_crc = self._calculate_modbus_crc(msg_data)
+        # Calculate and verify CRC over everything but the trailing CRC bytes
+        crc_offset = len(data) - 2
+        received_crc = _u16le_from(data, crc_offset)[0]
+        calculated_crc = self._calculate_modbus_crc(data, crc_offset)
         
         message.is_valid = (received_crc == calculated_crc)
         
@@ -128,25 +311,22 @@ class ProtocolParser:
         }
         
         # Parse function-specific data
-        if func_code in [3, 4]:  # Read Holding/Input Registers
-            if len(data) >= 6:
-                start_addr = struct.unpack('>H', data[2:4])[0]
-                num_regs = struct.unpack('>H', data[4:6])[0]
-                message.parsed_data.update({
-                    'start_address': start_addr,
-                    'register_count': num_regs
-                })
-        elif func_code in [1, 2]:  # Read Coils/Discrete Inputs
-            if len(data) >= 6:
-                start_addr = struct.unpack('>H', data[2:4])[0]
-                num_coils = struct.unpack('>H', data[4:6])[0]
-                message.parsed_data.update({
-                    'start_address': start_addr,
-                    'coil_count': num_coils
-                })
+        handler = self._fc_handlers.get(func_code)
+        if handler is not None and len(data) >= 6:
+            handler(data, message.parsed_data)
         
         message.description = f"Modbus RTU - Slave {slave_addr}, {message.parsed_data['function_name']}"
 
+    def _fc_read_bits(self, data: bytes, fields: Dict[str, Any]):
+        """Read Coils/Discrete Inputs"""
+        fields['start_address'] = _u16be_from(data, 2)[0]
+        fields['coil_count'] = _u16be_from(data, 4)[0]
+
+    def _fc_read_regs(self, data: bytes, fields: Dict[str, Any]):
+        """Read Holding/Input Registers"""
+        fields['start_address'] = _u16be_from(data, 2)[0]
+        fields['register_count'] = _u16be_from(data, 4)[0]
+
     def _parse_modbus_ascii(self, message: ParsedMessage):
         """Parse Modbus ASCII message"""
         data = message.raw_data
@@ -157,13 +337,17 @@ class ProtocolParser:
                 message.error_message = "Invalid Modbus ASCII frame"
                 return
             
-            hex_data = data[1:-2].decode('ascii')
-            if len(hex_data) % 2 != 0:
+            hex_payload = memoryview(data)[1:-2]
+            if len(hex_payload) % 2 != 0:
                 message.error_message = "Invalid hex data length"
                 return
             
-            # Convert hex string to bytes
-            binary_data = bytes.fromhex(hex_data)
+            # Convert hex digits to bytes straight from the raw frame
+            try:
+                binary_data = unhexlify(hex_payload)
+            except BinasciiError as e:
+                message.error_message = f"ASCII parsing error: {str(e)}"
+                return
             
             if len(binary_data) < 3:
                 message.error_message = "Message too short"
@@ -172,7 +356,7 @@ class ProtocolParser:
             slave_addr = binary_data[0]
             func_code = binary_data[1]
             lrc_received = binary_data[-1]
-            msg_data = binary_data[:-1]
+            msg_data = memoryview(binary_data)[:-1]
             
             # Calculate and verify LRC
             calculated_lrc = self._calculate_modbus_lrc(msg_data)
@@ -185,7 +369,7 @@ class ProtocolParser:
                 'lrc_received': f"0x{lrc_received:02X}",
                 'lrc_calculated': f"0x{calculated_lrc:02X}",
                 'lrc_valid': message.is_valid,
-                'hex_data': hex_data
+                'hex_data': str(hex_payload, 'ascii')
             }
             
             message.description = f"Modbus ASCII - Slave {slave_addr}, {message.parsed_data['function_name']}"
@@ -198,22 +382,24 @@ class ProtocolParser:
         data = message.raw_data
         
         try:
-            # Convert to string and remove line endings
-            nmea_str = data.decode('ascii').strip()
+            # Convert to string and remove line endings; ASCII decoding is one
+            # character per byte, so offset maps string indices back onto data
+            text = data.decode('ascii')
+            nmea_str = text.strip()
+            offset = len(text) - len(text.lstrip())
             
             if not nmea_str.startswith('$'):
                 message.error_message = "Invalid NMEA sentence start"
                 return
             
             # Split sentence and checksum
-            if '*' in nmea_str:
-                sentence, checksum_str = nmea_str.rsplit('*', 1)
-                received_checksum = int(checksum_str, 16)
+            star = nmea_str.rfind('*')
+            if star != -1:
+                sentence = nmea_str[:star]
+                received_checksum = int(nmea_str[star + 1:], 16)
                 
-                # Calculate checksum
-                calculated_checksum = 0
-                for char in sentence[1:]:  # Skip the '$'
-                    calculated_checksum ^= ord(char)
+                # Calculate checksum over the raw bytes between '$' and '*'
+                calculated_checksum = _xor_checksum(memoryview(data)[offset + 1:offset + star])
                 
                 message.is_valid = (received_checksum == calculated_checksum)
             else:
@@ -278,11 +464,9 @@ class ProtocolParser:
         """Parse custom binary protocol"""
         data = message.raw_data
         
-        message.parsed_data = {
-            'length': len(data),
-            'hex_dump': ' '.join(f'{b:02X}' for b in data),
-            'ascii_repr': ''.join(chr(b) if 32 <= b <= 126 else '.' for b in data)
-        }
+        message.parsed_data = _LazyFields(data, {
+            'length': len(data)
+        }, _CUSTOM_BINARY_RENDERERS)
         
         message.is_valid = True
         message.description = f"Binary - {len(data)} bytes"
@@ -299,35 +483,33 @@ class ProtocolParser:
             ascii_text = ""
             is_ascii = False
         
-        message.parsed_data = {
+        message.parsed_data = _LazyFields(data, {
             'length': len(data),
             'is_ascii': is_ascii,
-            'ascii_text': ascii_text if is_ascii else "",
-            'hex_dump': ' '.join(f'{b:02X}' for b in data),
-            'binary_repr': ''.join(f'{b:08b} ' for b in data).strip()
-        }
+            'ascii_text': ascii_text if is_ascii else ""
+        }, _RAW_RENDERERS)
         
         message.is_valid = True
         message.description = f"Raw - {len(data)} bytes"
 
-    def _calculate_modbus_crc(self, data: bytes) -> int:
-        """Calculate Modbus RTU CRC16"""
+    def _calculate_modbus_crc(self, data: bytes, length: Optional[int] = None) -> int:
+        """Calculate Modbus RTU CRC16 over the first length bytes (default all)"""
+        if length is not None:
+            data = memoryview(data)[:length]
+        
+        if _modbus_crc_fast is not None:
+            return _modbus_crc_fast(data)
+        
+        # One table lookup per byte instead of eight shift/xor steps
+        table = _CRC16_TABLE
         crc = 0xFFFF
         for byte in data:
-            crc ^= byte
-            for _ in range(8):
-                if crc & 1:
-                    crc = (crc >> 1) ^ 0xA001
-                else:
-                    crc >>= 1
+            crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
         return crc
 
     def _calculate_modbus_lrc(self, data: bytes) -> int:
         """Calculate Modbus ASCII LRC"""
-        lrc = 0
-        for byte in data:
-            lrc += byte
-        return (-lrc) & 0xFF
+        return (-sum(data)) & 0xFF
 
     def _get_modbus_function_name(self, func_code: int) -> str:
         """Get Modbus function name from code"""
@@ -349,31 +531,39 @@ class ProtocolStatistics:
         self.reset()
     
     def reset(self):
-        self.message_counts = {protocol: 0 for protocol in ProtocolType}
-        self.error_counts = {protocol: 0 for protocol in ProtocolType}
-        self.byte_counts = {protocol: 0 for protocol in ProtocolType}
+        # One contiguous counter array per metric, indexed by _PROTOCOL_INDEX
+        self.message_counts = array('Q', bytes(8 * len(_PROTOCOL_INDEX)))
+        self.error_counts = array('Q', bytes(8 * len(_PROTOCOL_INDEX)))
+        self.byte_counts = array('Q', bytes(8 * len(_PROTOCOL_INDEX)))
         self.start_time = datetime.now()
+        self._start_ns = time.monotonic_ns()
     
     def update(self, message: ParsedMessage):
-        self.message_counts[message.protocol] += 1
-        self.byte_counts[message.protocol] += len(message.raw_data)
+        index = _PROTOCOL_INDEX[message.protocol]
+        self.message_counts[index] += 1
+        self.byte_counts[index] += len(message.raw_data)
         if not message.is_valid:
-            self.error_counts[message.protocol] += 1
+            self.error_counts[index] += 1
+    
+    def get_counts(self, protocol: ProtocolType) -> Tuple[int, int, int]:
+        """Return (messages, bytes, errors) for a protocol"""
+        index = _PROTOCOL_INDEX[protocol]
+        return self.message_counts[index], self.byte_counts[index], self.error_counts[index]
     
     def get_summary(self) -> Dict[str, Any]:
-        total_messages = sum(self.message_counts.values())
-        total_bytes = sum(self.byte_counts.values())
-        total_errors = sum(self.error_counts.values())
+        total_messages = sum(self.message_counts)
+        total_bytes = sum(self.byte_counts)
+        total_errors = sum(self.error_counts)
         
-        runtime = datetime.now() - self.start_time
+        runtime = (time.monotonic_ns() - self._start_ns) / 1e9
         
         return {
             'total_messages': total_messages,
             'total_bytes': total_bytes,
             'total_errors': total_errors,
-            'runtime_seconds': runtime.total_seconds(),
-            'messages_per_second': total_messages / max(runtime.total_seconds(), 1),
-            'bytes_per_second': total_bytes / max(runtime.total_seconds(), 1),
+            'runtime_seconds': runtime,
+            'messages_per_second': total_messages / max(runtime, 1),
+            'bytes_per_second': total_bytes / max(runtime, 1),
             'error_rate': (total_errors / max(total_messages, 1)) * 100,
-            'protocol_breakdown': dict(self.message_counts)
+            'protocol_breakdown': dict(zip(ProtocolType, self.message_counts))
         }
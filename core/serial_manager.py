@@ -2,15 +2,51 @@
 Enhanced Serial Manager with Protocol Parsing Support
 """
 
+import os
+import re
+import time
+import select
+import selectors
 import serial
 import threading
-import time
+from array import array
 from datetime import datetime
-from typing import Callable, Optional, List, Dict, Any
+from functools import lru_cache
+from typing import Callable, Optional, List, Dict, Any, Tuple
 from queue import Queue, Empty
 
 from .protocol_parser import ProtocolParser, ProtocolType, ParsedMessage
 
+# Traffic counters are kept in one array('Q'); these name the slots
+_STAT_KEYS = ('port_a_rx', 'port_a_tx', 'port_b_rx', 'port_b_tx',
+              'messages_a_to_b', 'messages_b_to_a', 'bytes_a_to_b', 'bytes_b_to_a')
+(_PORT_A_RX, _PORT_A_TX, _PORT_B_RX, _PORT_B_TX,
+ _MESSAGES_A_TO_B, _MESSAGES_B_TO_A, _BYTES_A_TO_B, _BYTES_B_TO_A) = range(len(_STAT_KEYS))
+
+# An unterminated NMEA/Modbus ASCII frame is held for its CR/LF up to this
+# many bytes; past that the buffer is passed on rather than held forever
+_MAX_ASCII_FRAME = 1024
+
+# Bytes an unfinished NMEA/Modbus ASCII frame can consist of; anything else
+# (e.g. a Modbus RTU frame from slave 0x24 or 0x3A) is binary and not held
+_ASCII_FRAME_SO_FAR = re.compile(rb'[\x20-\x7E\r]*')
+
+# Whole hex bytes only, once whitespace is removed
+_HEX_BYTES = re.compile(r'(?:[0-9A-Fa-f]{2})*')
+
+@lru_cache(maxsize=4096)
+def hex_to_bytes(text: str) -> bytes:
+    """Parse whitespace-separated hex bytes, caching the result per string
+    
+    Shared by the rules editor and rule compilation so both accept and
+    reject exactly the same input.
+    """
+    compact = ''.join(text.split())
+    # Reject bad input before bytes.fromhex builds an exception message
+    if _HEX_BYTES.fullmatch(compact) is None:
+        raise ValueError("Invalid hex format")
+    return bytes.fromhex(compact)
+
 class SerialManager:
     def __init__(self):
         self.port_a = None
@@ -26,29 +62,31 @@ class SerialManager:
         self.data_callback = None
         self.status_callback = None
         
-        self.monitor_thread_a = None
-        self.monitor_thread_b = None
+        self.monitor_thread = None
         self.stop_monitoring = False
         
+        # Self-pipe used to wake the monitor thread when data is injected
+        self._wake_r = None
+        self._wake_w = None
+        
+        # Raw port descriptors, read and written directly while monitoring
+        self._fd_a = None
+        self._fd_b = None
+        
         # Protocol parsing
         self.protocol_parser = ProtocolParser()
         self.protocol_callback = None  # Callback for parsed messages
         
         # Statistics
-        self.stats = {
-            'port_a_rx': 0,
-            'port_a_tx': 0,
-            'port_b_rx': 0,
-            'port_b_tx': 0,
-            'messages_a_to_b': 0,
-            'messages_b_to_a': 0,
-            'bytes_a_to_b': 0,
-            'bytes_b_to_a': 0,
-            'start_time': None
-        }
+        self.stats = array('Q', bytes(8 * len(_STAT_KEYS)))
+        self.start_time = None
+        self._start_ns = 0
         
         # Spoofing rules
         self.spoofing_rules = []
+        # Enabled rules as (prefilter, patterns, replacements), replaced as a whole
+        # so the monitor thread never sees a half-updated rule set
+        self._spoof_rules = (None, (), ())
         self.spoofing_enabled = True
         
         # Message queues for injection
@@ -83,7 +121,8 @@ class SerialManager:
             )
             
             self.is_connected = True
-            self.stats['start_time'] = datetime.now()
+            self.start_time = datetime.now()
+            self._start_ns = time.monotonic_ns()
             
             if self.status_callback:
                 self.status_callback("Connected to both ports")
@@ -120,12 +159,16 @@ class SerialManager:
         self.stop_monitoring = False
         self.is_monitoring = True
         
-        # Start monitoring threads
-        self.monitor_thread_a = threading.Thread(target=self._monitor_port_a, daemon=True)
-        self.monitor_thread_b = threading.Thread(target=self._monitor_port_b, daemon=True)
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        
+        self._fd_a = self.port_a.fileno()
+        self._fd_b = self.port_b.fileno()
         
-        self.monitor_thread_a.start()
-        self.monitor_thread_b.start()
+        # Start the monitoring thread
+        self.monitor_thread = threading.Thread(target=self._monitor_ports, daemon=True)
+        self.monitor_thread.start()
         
         if self.status_callback:
             self.status_callback("Monitoring started")
@@ -136,205 +179,264 @@ class SerialManager:
         """Stop monitoring ports"""
         self.stop_monitoring = True
         self.is_monitoring = False
+        self._wake_monitor()
         
-        # Wait for threads to finish
-        if self.monitor_thread_a and self.monitor_thread_a.is_alive():
-            self.monitor_thread_a.join(timeout=2.0)
-        if self.monitor_thread_b and self.monitor_thread_b.is_alive():
-            self.monitor_thread_b.join(timeout=2.0)
+        # Wait for the thread to finish
+        if self.monitor_thread and self.monitor_thread.is_alive():
+            self.monitor_thread.join(timeout=2.0)
+        
+        if not (self.monitor_thread and self.monitor_thread.is_alive()):
+            for fd in (self._wake_r, self._wake_w):
+                if fd is not None:
+                    os.close(fd)
+            self._wake_r = None
+            self._wake_w = None
         
         if self.status_callback:
             self.status_callback("Monitoring stopped")
 
-    def _monitor_port_a(self):
-        """Monitor Port A and forward to Port B"""
-        buffer = b''
-        
-        while not self.stop_monitoring and self.is_connected:
+    def _wake_monitor(self):
+        """Wake the monitor thread out of select()"""
+        if self._wake_w is not None:
             try:
-                # Check for manual injection
+                os.write(self._wake_w, b'\0')
+            except OSError:
+                # Pipe full means a wake-up is already pending
+                pass
+
+    def _monitor_ports(self):
+        """Monitor both ports and forward data between them
+        
+        A single thread blocks in select() on both port descriptors and the
+        wake-up pipe, so an idle link costs no CPU and data is handled as
+        soon as the kernel reports it.
+        """
+        buffers = {'A': bytearray(), 'B': bytearray()}
+        selector = selectors.DefaultSelector()
+        
+        try:
+            selector.register(self._fd_a, selectors.EVENT_READ, 'A')
+            selector.register(self._fd_b, selectors.EVENT_READ, 'B')
+            selector.register(self._wake_r, selectors.EVENT_READ, None)
+            
+            # Anything injected before monitoring started
+            self._send_injections()
+            
+            while not self.stop_monitoring and self.is_connected:
+                for key, _ in selector.select(timeout=0.5):
+                    if key.data is None:
+                        self._drain_wake_pipe()
+                        self._send_injections()
+                    else:
+                        port_name = key.data
+                        try:
+                            self._read_port(port_name, buffers[port_name])
+                        except Exception as e:
+                            if self.status_callback:
+                                self.status_callback(f"Port {port_name} error: {str(e)}")
+                            return
+                
+        except Exception as e:
+            if self.status_callback:
+                self.status_callback(f"Monitor error: {str(e)}")
+        finally:
+            selector.close()
+
+    def _drain_wake_pipe(self):
+        """Discard pending wake-up bytes"""
+        try:
+            while os.read(self._wake_r, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _send_injections(self):
+        """Write all queued manual injections to their ports"""
+        for queue, fd, stat_index, direction in (
+                (self.inject_queue_a, self._fd_a, _PORT_A_TX, "INJECT→A"),
+                (self.inject_queue_b, self._fd_b, _PORT_B_TX, "INJECT→B")):
+            while True:
                 try:
-                    inject_data = self.inject_queue_a.get_nowait()
-                    self.port_a.write(inject_data)
-                    self.stats['port_a_tx'] += len(inject_data)
-                    
-                    if self.data_callback:
-                        self.data_callback(inject_data, "INJECT→A", datetime.now())
+                    inject_data = queue.get_nowait()
                 except Empty:
-                    pass
-                
-                # Read from Port A
-                if self.port_a.in_waiting > 0:
-                    data = self.port_a.read(self.port_a.in_waiting)
-                    if data:
-                        buffer += data
-                        
-                        # Try to extract complete messages
-                        messages = self._extract_messages(buffer)
-                        for message_data in messages:
-                            buffer = buffer[len(message_data):]
-                            self._process_message(message_data, "A→B")
+                    break
                 
-                time.sleep(0.001)  # Small delay to prevent CPU spinning
+                try:
+                    self._write_fd(fd, inject_data)
+                except TimeoutError as e:
+                    if self.status_callback:
+                        self.status_callback(f"Injection error: {str(e)}")
+                    continue
+                self.stats[stat_index] += len(inject_data)
                 
-            except Exception as e:
-                if self.status_callback:
-                    self.status_callback(f"Port A error: {str(e)}")
-                break
+                if self.data_callback:
+                    self.data_callback(inject_data, direction, datetime.now())
 
-    def _monitor_port_b(self):
-        """Monitor Port B and forward to Port A"""
-        buffer = b''
-        
-        while not self.stop_monitoring and self.is_connected:
+    def _read_port(self, port_name: str, buffer: bytearray):
+        """Read available data from a port and forward complete messages"""
+        if port_name == 'A':
+            fd, direction = self._fd_a, "A→B"
+        else:
+            fd, direction = self._fd_b, "B→A"
+        
+        # select() reported the port readable, so one read takes all of it
+        try:
+            data = os.read(fd, 65536)
+        except BlockingIOError:
+            return
+        if not data:
+            raise OSError("device reports readiness to read but returned no data")
+        
+        buffer += data
+        
+        # Try to extract complete messages, then drop them
+        # from the buffer in one step
+        messages, consumed = self._extract_messages(buffer)
+        if consumed:
+            del buffer[:consumed]
+        if messages:
+            self._process_messages(messages, direction)
+
+    def _write_fd(self, fd: int, data: bytes):
+        """Write all of data to a port descriptor, waiting if its buffer is full
+        
+        Raises TimeoutError if the port accepts nothing for self.timeout
+        seconds (peer not reading, flow control held), so a stalled port
+        can't keep the monitor thread from servicing the other one.
+        """
+        view = memoryview(data)
+        deadline = time.monotonic() + self.timeout
+        while view:
             try:
-                # Check for manual injection
-                try:
-                    inject_data = self.inject_queue_b.get_nowait()
-                    self.port_b.write(inject_data)
-                    self.stats['port_b_tx'] += len(inject_data)
+                written = os.write(fd, view)
+            except BlockingIOError:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"port write timed out, {len(view)} of {len(data)} bytes dropped")
+                select.select([], [fd], [], remaining)
+                continue
+            view = view[written:]
+            deadline = time.monotonic() + self.timeout
+
+    def _extract_messages(self, buffer: bytearray) -> Tuple[List[bytes], int]:
+        """Extract complete messages from buffer based on protocol patterns
+        
+        Returns the messages and the number of bytes they consumed from the
+        start of the buffer. Positions are tracked as offsets so the buffer
+        is not re-sliced for every message.
+        """
+        messages = []
+        pos = 0
+        size = len(buffer)
+        
+        with memoryview(buffer) as view:
+            while pos < size:
+                # 1. NMEA ($...\r\n) and 2. Modbus ASCII (:...\r\n)
+                if buffer[pos] in (0x24, 0x3A):
+                    end_pos = buffer.find(b'\r\n', pos)
+                    if end_pos != -1:
+                        messages.append(view[pos:end_pos + 2].tobytes())
+                        pos = end_pos + 2
+                        continue
                     
-                    if self.data_callback:
-                        self.data_callback(inject_data, "INJECT→B", datetime.now())
-                except Empty:
-                    pass
-                
-                # Read from Port B
-                if self.port_b.in_waiting > 0:
-                    data = self.port_b.read(self.port_b.in_waiting)
-                    if data:
-                        buffer += data
-                        
-                        # Try to extract complete messages
-                        messages = self._extract_messages(buffer)
-                        for message_data in messages:
-                            buffer = buffer[len(message_data):]
-                            self._process_message(message_data, "B→A")
+                    # Keep a frame split across reads buffered until its CR/LF arrives
+                    if size - pos <= _MAX_ASCII_FRAME and _ASCII_FRAME_SO_FAR.fullmatch(buffer, pos):
+                        break
                 
-                time.sleep(0.001)  # Small delay to prevent CPU spinning
+                # 3. Modbus RTU (try to detect complete frame)
+                if size - pos >= 4:
+                    # Simple heuristic: if we have at least 4 bytes and no new data for a while
+                    # This is a simplified approach - in practice, you'd need more sophisticated timing
+                    messages.append(view[pos:].tobytes())
+                    pos = size
+                    break
                 
-            except Exception as e:
-                if self.status_callback:
-                    self.status_callback(f"Port B error: {str(e)}")
-                break
+                # 4. Line-based ASCII protocols
+                end_pos = buffer.find(b'\n', pos)
+                if end_pos == -1:
+                    # 5. For very short messages or unknown protocols, wait for more data
+                    # This is a timeout-based approach that would need refinement
+                    break
+                messages.append(view[pos:end_pos + 1].tobytes())
+                pos = end_pos + 1
+        
+        return messages, pos
 
-    def _extract_messages(self, buffer: bytes) -> List[bytes]:
-        """Extract complete messages from buffer based on protocol patterns"""
-        messages = []
-        
-        if len(buffer) == 0:
-            return messages
-        
-        # Try different message extraction strategies
-        
-        # 1. NMEA messages (start with $ and end with \r\n)
-        if buffer.startswith(b'$'):
-            end_pos = buffer.find(b'\r\n')
-            if end_pos != -1:
-                messages.append(buffer[:end_pos + 2])
-                return messages
-        
-        # 2. Modbus ASCII (start with : and end with \r\n)
-        if buffer.startswith(b':'):
-            end_pos = buffer.find(b'\r\n')
-            if end_pos != -1:
-                messages.append(buffer[:end_pos + 2])
-                return messages
-        
-        # 3. Modbus RTU (try to detect complete frame)
-        if len(buffer) >= 4:
-            # Simple heuristic: if we have at least 4 bytes and no new data for a while
-            # This is a simplified approach - in practice, you'd need more sophisticated timing
-            messages.append(buffer)
-            return messages
-        
-        # 4. Line-based ASCII protocols
-        if b'\n' in buffer:
-            lines = buffer.split(b'\n')
-            for i, line in enumerate(lines[:-1]):  # All but the last (potentially incomplete) line
-                if line.endswith(b'\r'):
-                    messages.append(line + b'\n')
-                else:
-                    messages.append(line + b'\n')
-            return messages
-        
-        # 5. If buffer is getting large, treat as single message
-        if len(buffer) > 1024:
-            messages.append(buffer)
-            return messages
-        
-        # 6. For very short messages or unknown protocols, wait for more data
-        # This is a timeout-based approach that would need refinement
-        return messages
-
-    def _process_message(self, data: bytes, direction: str):
-        """Process a complete message with protocol parsing and spoofing"""
-        original_data = data
-        modified_data = data
-        spoofed = False
-        
-        # Apply spoofing rules
-        if self.spoofing_enabled:
-            modified_data, spoofed = self._apply_spoofing_rules(data)
-        
-        # Parse the message
-        parsed_message = self.protocol_parser.parse_message(original_data)
+    def _process_messages(self, messages: List[bytes], direction: str):
+        """Process a burst of complete messages with protocol parsing and spoofing"""
+        results = []
+        out = bytearray()
+        received = 0
+        
+        for original_data in messages:
+            modified_data = original_data
+            spoofed = False
+            
+            # Apply spoofing rules
+            if self.spoofing_enabled:
+                modified_data, spoofed = self._apply_spoofing_rules(original_data)
+            
+            # Parse the message
+            parsed_message = self.protocol_parser.parse_message(original_data)
+            
+            results.append((original_data, modified_data, spoofed, parsed_message))
+            out += modified_data
+            received += len(original_data)
         
-        # Forward the (possibly modified) data
+        # Forward the (possibly modified) burst with a single write
         try:
             if direction == "A→B" and self.port_b:
-                self.port_b.write(modified_data)
-                self.stats['port_a_rx'] += len(original_data)
-                self.stats['port_b_tx'] += len(modified_data)
-                self.stats['messages_a_to_b'] += 1
-                self.stats['bytes_a_to_b'] += len(modified_data)
+                self._write_fd(self._fd_b, out)
+                stats = self.stats
+                stats[_PORT_A_RX] += received
+                stats[_PORT_B_TX] += len(out)
+                stats[_MESSAGES_A_TO_B] += len(messages)
+                stats[_BYTES_A_TO_B] += len(out)
             elif direction == "B→A" and self.port_a:
-                self.port_a.write(modified_data)
-                self.stats['port_b_rx'] += len(original_data)
-                self.stats['port_a_tx'] += len(modified_data)
-                self.stats['messages_b_to_a'] += 1
-                self.stats['bytes_b_to_a'] += len(modified_data)
+                self._write_fd(self._fd_a, out)
+                stats = self.stats
+                stats[_PORT_B_RX] += received
+                stats[_PORT_A_TX] += len(out)
+                stats[_MESSAGES_B_TO_A] += len(messages)
+                stats[_BYTES_B_TO_A] += len(out)
         except Exception as e:
             if self.status_callback:
                 self.status_callback(f"Forward error: {str(e)}")
         
         # Notify callbacks
-        if self.data_callback:
-            self.data_callback(original_data, direction, datetime.now(), 
-                             modified_data if spoofed else None, spoofed)
-        
-        if self.protocol_callback:
-            self.protocol_callback(parsed_message, direction)
+        for original_data, modified_data, spoofed, parsed_message in results:
+            if self.data_callback:
+                self.data_callback(original_data, direction, parsed_message.timestamp, 
+                                 modified_data if spoofed else None, spoofed)
+            
+            if self.protocol_callback:
+                self.protocol_callback(parsed_message, direction)
 
     def _apply_spoofing_rules(self, data: bytes) -> tuple[bytes, bool]:
         """Apply spoofing rules to data"""
         modified_data = data
         spoofed = False
         
-        for rule in self.spoofing_rules:
-            if not rule.get('enabled', True):
-                continue
-            
-            try:
-                if rule['type'] == 'ascii':
-                    pattern = rule['pattern'].encode('ascii')
-                    replacement = rule['replacement'].encode('ascii')
-                elif rule['type'] == 'hex':
-                    pattern = bytes.fromhex(rule['pattern'].replace(' ', ''))
-                    replacement = bytes.fromhex(rule['replacement'].replace(' ', ''))
-                else:
-                    continue
-                
-                if pattern in modified_data:
-                    modified_data = modified_data.replace(pattern, replacement)
-                    spoofed = True
-                    
-            except Exception as e:
-                # Skip invalid rules
-                continue
+        # One scan for all patterns; rules can only fire if one of them occurs
+        prefilter, patterns, replacements = self._spoof_rules
+        if prefilter is None or prefilter.search(data) is None:
+            return modified_data, spoofed
+        
+        for pattern, replacement in zip(patterns, replacements):
+            if pattern in modified_data:
+                modified_data = modified_data.replace(pattern, replacement)
+                spoofed = True
         
         return modified_data, spoofed
 
+    def _compile_rule(self, rule: Dict) -> Optional[Tuple[bytes, bytes]]:
+        """Convert a rule's pattern and replacement to bytes"""
+        if rule['type'] == 'ascii':
+            return rule['pattern'].encode('ascii'), rule['replacement'].encode('ascii')
+        elif rule['type'] == 'hex':
+            return hex_to_bytes(rule['pattern']), hex_to_bytes(rule['replacement'])
+        return None
+
     def inject_data(self, data: bytes, target_port: str):
         """Inject data into specified port"""
         try:
@@ -342,36 +444,52 @@ class SerialManager:
                 self.inject_queue_a.put(data)
             elif target_port.upper() == 'B':
                 self.inject_queue_b.put(data)
+            self._wake_monitor()
         except Exception as e:
             if self.status_callback:
                 self.status_callback(f"Injection error: {str(e)}")
 
     def get_statistics(self) -> Dict[str, Any]:
         """Get current statistics"""
-        stats = self.stats.copy()
+        stats = dict(zip(_STAT_KEYS, self.stats))
+        stats['start_time'] = self.start_time
         if stats['start_time']:
-            runtime = datetime.now() - stats['start_time']
-            stats['runtime_seconds'] = runtime.total_seconds()
-            stats['messages_per_second'] = (stats['messages_a_to_b'] + stats['messages_b_to_a']) / max(runtime.total_seconds(), 1)
+            runtime = (time.monotonic_ns() - self._start_ns) / 1e9
+            stats['runtime_seconds'] = runtime
+            stats['messages_per_second'] = (stats['messages_a_to_b'] + stats['messages_b_to_a']) / max(runtime, 1)
         return stats
 
     def reset_statistics(self):
         """Reset all statistics"""
-        self.stats = {
-            'port_a_rx': 0,
-            'port_a_tx': 0,
-            'port_b_rx': 0,
-            'port_b_tx': 0,
-            'messages_a_to_b': 0,
-            'messages_b_to_a': 0,
-            'bytes_a_to_b': 0,
-            'bytes_b_to_a': 0,
-            'start_time': datetime.now() if self.is_connected else None
-        }
+        self.stats = array('Q', bytes(8 * len(_STAT_KEYS)))
+        self.start_time = datetime.now() if self.is_connected else None
+        self._start_ns = time.monotonic_ns()
 
     def set_spoofing_rules(self, rules: List[Dict]):
         """Set spoofing rules"""
         self.spoofing_rules = rules
+        
+        # Encode patterns once here rather than for every forwarded message
+        compiled_rules = []
+        for rule in rules:
+            if not rule.get('enabled', True):
+                continue
+            try:
+                compiled = self._compile_rule(rule)
+            except Exception as e:
+                # Skip invalid rules
+                if self.status_callback:
+                    self.status_callback(f"Skipping invalid spoofing rule: {str(e)}")
+                continue
+            if compiled is not None:
+                compiled_rules.append(compiled)
+        
+        # Parallel pattern/replacement tuples, plus one alternation of every
+        # pattern for prefiltering
+        patterns = tuple(pattern for pattern, _ in compiled_rules)
+        replacements = tuple(replacement for _, replacement in compiled_rules)
+        prefilter = re.compile(b'|'.join(map(re.escape, patterns))) if patterns else None
+        self._spoof_rules = (prefilter, patterns, replacements)
 
     def set_spoofing_enabled(self, enabled: bool):
         """Enable or disable spoofing"""
@@ -4,10 +4,23 @@ Displays real-time communication logs and statistics
 """
 
 import tkinter as tk
-from tkinter import ttk, scrolledtext
+from tkinter import ttk, font as tkfont
+from collections import deque
 from datetime import datetime
-from typing import List, Dict, Any
-import threading
+from itertools import compress, islice
+from typing import Iterable, List, Dict, Any, Tuple
+
+# Printable ASCII maps to itself; everything else becomes '.'
+_PRINTABLE_OR_DOT = bytes(b if 32 <= b <= 126 else 0x2E for b in range(256))
+# str.translate table turning every non-printable latin-1 char into a \xNN escape
+_ESCAPE_TABLE = {b: f'\\x{b:02x}' for b in range(256) if not 32 <= b <= 126}
+# Compact direction codes stored alongside the log entries for filtering
+_DIRECTION_CODES = {"A→B": 0, "B→A": 1, "INJECT→A": 2, "INJECT→B": 3}
+_OTHER_DIRECTION = len(_DIRECTION_CODES)
+# Text tag used to colour each direction
+_DIR_TAG = {"A→B": "a_to_b", "B→A": "b_to_a", "INJECT→A": "inject", "INJECT→B": "inject"}
+# bytes.translate tables mapping a direction code to 1 and every other code to 0
+_CODE_MASKS = [bytes(int(b == code) for b in range(256)) for code in range(_OTHER_DIRECTION + 1)]
 
 class DashboardTab:
     def __init__(self, parent_notebook, serial_manager, logger):
@@ -19,13 +32,32 @@ class DashboardTab:
         parent_notebook.add(self.frame, text="Dashboard")
         
         # Data storage
-        self.log_entries = []
         self.max_log_entries = 1000
+        self.log_entries = deque(maxlen=self.max_log_entries)
+        self.log_directions = bytearray()  # direction code of each stored entry
         self.filter_direction = "All"
+        self.filter_code = None  # None shows every direction
+        self.format_type = "both"
         self.filter_protocol = "All"
         
-        # Threading lock for GUI updates
-        self.update_lock = threading.Lock()
+        # Virtualized log view: entries passing the filter, the index of the
+        # first one rendered, and whether the view follows new entries
+        self._filtered_entries = deque()
+        self._view_start = 0
+        self._visible_rows = 40
+        self._rendered_lines = deque()
+        self._follow_tail = True
+        self._needs_render = False
+        self._see_pending = False
+        
+        # Last (text, foreground) written to each statistics label
+        self._label_cache = {}
+        
+        # Entries from the serial thread wait here; the Tk thread drains them
+        # and is the only thread that touches the log state and widgets.
+        # Bounded like the log: under overload the oldest entries are dropped,
+        # since they would be pushed out of the log anyway.
+        self._pending = deque(maxlen=self.max_log_entries)
         
         self.setup_ui()
 
@@ -45,6 +77,9 @@ class DashboardTab:
         
         self.setup_statistics_section(top_frame)
         self.setup_log_section(bottom_frame)
+        
+        # Render queued entries in batches at ~30 Hz
+        self.frame.after(33, self._drain_pending)
 
     def setup_statistics_section(self, parent):
         """Setup statistics and control section"""
@@ -135,11 +170,11 @@ class DashboardTab:
         format_frame.pack(side=tk.LEFT, padx=5)
         
         ttk.Radiobutton(format_frame, text="ASCII", variable=self.format_var, 
-                       value="ascii", command=self.refresh_log_display).pack(side=tk.LEFT)
+                       value="ascii", command=self.on_format_changed).pack(side=tk.LEFT)
         ttk.Radiobutton(format_frame, text="HEX", variable=self.format_var, 
-                       value="hex", command=self.refresh_log_display).pack(side=tk.LEFT)
+                       value="hex", command=self.on_format_changed).pack(side=tk.LEFT)
         ttk.Radiobutton(format_frame, text="Both", variable=self.format_var, 
-                       value="both", command=self.refresh_log_display).pack(side=tk.LEFT)
+                       value="both", command=self.on_format_changed).pack(side=tk.LEFT)
         
         # Control buttons
         button_frame = ttk.Frame(control_frame)
@@ -154,14 +189,23 @@ class DashboardTab:
         log_frame = ttk.LabelFrame(parent, text="Communication Log")
         log_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
-        # Create text widget with scrollbar
-        self.log_text = scrolledtext.ScrolledText(
+        # Only the entries that fit in the text widget are rendered; the
+        # scrollbar is driven manually over the filtered entry list
+        self.log_scrollbar = ttk.Scrollbar(log_frame, orient=tk.VERTICAL, command=self.on_log_scroll)
+        self.log_scrollbar.pack(side=tk.RIGHT, fill=tk.Y, pady=5)
+        
+        self.log_text = tk.Text(
             log_frame, 
             wrap=tk.WORD, 
             font=('Courier', 9),
             state=tk.DISABLED
         )
-        self.log_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.log_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.log_line_height = max(tkfont.Font(font=('Courier', 9)).metrics('linespace'), 1)
+        
+        self.log_text.bind('<Configure>', self.on_log_resized)
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.log_text.bind(sequence, self.on_log_wheel)
         
         # Configure text tags for color coding
         self.log_text.tag_configure("a_to_b", foreground="blue")
@@ -173,75 +217,125 @@ class DashboardTab:
 
     def add_log_entry(self, data: bytes, direction: str, timestamp: datetime, 
                      modified_data: bytes = None, spoofed: bool = False):
-        """Add a new log entry"""
+        """Queue a new log entry; safe to call from any thread"""
         if self.paused:
             return
         
-        with self.update_lock:
-            # Create log entry
-            entry = {
-                'data': data,
-                'direction': direction,
-                'timestamp': timestamp,
-                'modified_data': modified_data,
-                'spoofed': spoofed
-            }
+        self._pending.append({
+            'data': data,
+            'direction': direction,
+            'timestamp': timestamp,
+            'time_str': f"{timestamp:%H:%M:%S}.{timestamp.microsecond // 1000:03d}",
+            'modified_data': modified_data,
+            'spoofed': spoofed,
+            'formatted': {}  # format type -> (data text, modified text)
+        })
+
+    def _drain_pending(self):
+        """Store queued entries and render them with a single display update"""
+        shown = []
+        for _ in range(500):
+            try:
+                entry = self._pending.popleft()
+            except IndexError:
+                break
             
-            # Add to storage
+            # The deque drops its oldest entry once full
+            if len(self.log_entries) == self.log_entries.maxlen:
+                self.drop_log_entry(self.log_entries[0])
+                del self.log_directions[0]
+            code = _DIRECTION_CODES.get(entry['direction'], _OTHER_DIRECTION)
             self.log_entries.append(entry)
+            self.log_directions.append(code)
             
-            # Limit entries
-            if len(self.log_entries) > self.max_log_entries:
-                self.log_entries.pop(0)
-            
-            # Update display
-            self.add_log_line(entry)
+            if self.filter_code is None or code == self.filter_code:
+                self._filtered_entries.append(entry)
+                shown.append(entry)
+        
+        if self._needs_render or len(shown) >= self._visible_rows:
+            self.render_log_window()
+        elif shown:
+            self.add_log_lines(shown)
+        
+        self.frame.after(33, self._drain_pending)
+
+    def drop_log_entry(self, entry: Dict):
+        """Remove the oldest stored entry from the filtered view"""
+        if not self._filtered_entries or self._filtered_entries[0] is not entry:
+            return
+        
+        self._filtered_entries.popleft()
+        if self._view_start > 0:
+            # The rendered window is unchanged, only its index shifts
+            self._view_start -= 1
+        elif self._rendered_lines:
+            self._needs_render = True
 
-    def add_log_line(self, entry: Dict):
-        """Add a single log line to the display"""
-        if not self.should_show_entry(entry):
+    def add_log_lines(self, entries: List[Dict]):
+        """Show newly added entries if the view is following the tail"""
+        if not self._follow_tail:
+            self.update_log_scrollbar()
             return
         
         self.log_text.config(state=tk.NORMAL)
+        self.insert_log_lines(entries)
         
-        # Format timestamp
-        time_str = entry['timestamp'].strftime("%H:%M:%S.%f")[:-3]
+        # Drop rows scrolled off the top so the widget holds one window
+        dropped_lines = 0
+        while len(self._rendered_lines) > self._visible_rows:
+            dropped_lines += self._rendered_lines.popleft()
+            self._view_start += 1
+        if dropped_lines:
+            self.log_text.delete(1.0, f"{dropped_lines + 1}.0")
         
+        self.log_text.config(state=tk.DISABLED)
+        
+        # Auto-scroll to bottom
+        self.schedule_see_end()
+        self.update_log_scrollbar()
+
+    def insert_log_lines(self, entries: Iterable[Dict]):
+        """Append entries to the text widget with a single insert call"""
+        parts = []
+        format_type = self.format_type
+        for entry in entries:
+            self._rendered_lines.append(self.log_line_parts(entry, format_type, parts))
+        if parts:
+            self.log_text.insert(tk.END, *parts)
+
+    def log_line_parts(self, entry: Dict, format_type: str, parts: List) -> int:
+        """Append an entry's (text, tags) pairs to parts and return its line count"""
         # Add timestamp
-        self.log_text.insert(tk.END, f"[{time_str}] ", "timestamp")
+        parts += (f"[{entry['time_str']}] ", "timestamp")
         
         # Add direction with color
         direction = entry['direction']
-        if direction == "A→B":
-            tag = "a_to_b"
-        elif direction == "B→A":
-            tag = "b_to_a"
-        elif "INJECT" in direction:
-            tag = "inject"
-        else:
-            tag = "direction"
-        
-        self.log_text.insert(tk.END, f"{direction:10} ", tag)
+        parts += (f"{direction:10} ", _DIR_TAG.get(direction, "direction"))
         
         # Add spoofed indicator
         if entry['spoofed']:
-            self.log_text.insert(tk.END, "[SPOOFED] ", "spoofed")
+            parts += ("[SPOOFED] ", "spoofed")
         
         # Add data based on format selection
-        format_type = self.format_var.get()
-        data_str = self.format_data(entry['data'], format_type)
+        data_str, modified_str = self.get_formatted(entry, format_type)
         
         if entry['spoofed'] and entry['modified_data']:
-            modified_str = self.format_data(entry['modified_data'], format_type)
-            self.log_text.insert(tk.END, f"Original: {data_str}\n")
-            self.log_text.insert(tk.END, f"          Modified: {modified_str}\n", "spoofed")
-        else:
-            self.log_text.insert(tk.END, f"{data_str}\n")
+            parts += (f"Original: {data_str}\n", (),
+                      f"          Modified: {modified_str}\n", "spoofed")
+            return 2
         
-        self.log_text.config(state=tk.DISABLED)
-        
-        # Auto-scroll to bottom
-        self.log_text.see(tk.END)
+        parts += (f"{data_str}\n", ())
+        return 1
+
+    def get_formatted(self, entry: Dict, format_type: str) -> Tuple[str, str]:
+        """Return the entry's data formatted for display, formatting it only once per format"""
+        formatted = entry['formatted'].get(format_type)
+        if formatted is None:
+            modified_data = entry['modified_data'] if entry['spoofed'] else None
+            formatted = (self.format_data(entry['data'], format_type),
+                         self.format_data(modified_data, format_type))
+            entry['formatted'][format_type] = formatted
+        return formatted
 
     def format_data(self, data: bytes, format_type: str) -> str:
         """Format data according to the specified format"""
@@ -249,99 +343,197 @@ class DashboardTab:
             return ""
         
         if format_type == "ascii":
-            return ''.join(chr(b) if 32 <= b <= 126 else f'\\x{b:02x}' for b in data)
+            return data.decode('latin-1').translate(_ESCAPE_TABLE)
         elif format_type == "hex":
-            return ' '.join(f'{b:02X}' for b in data)
+            return data.hex(' ').upper()
         else:  # both
-            ascii_str = ''.join(chr(b) if 32 <= b <= 126 else '.' for b in data)
-            hex_str = ' '.join(f'{b:02X}' for b in data)
-            return f"ASCII: {ascii_str} | HEX: {hex_str}"
+            ascii_str = data.translate(_PRINTABLE_OR_DOT).decode('ascii')
+            return f"ASCII: {ascii_str} | HEX: {data.hex(' ').upper()}"
 
-    def should_show_entry(self, entry: Dict) -> bool:
-        """Check if entry should be displayed based on filters"""
-        direction_filter = self.direction_filter.get()
-        if direction_filter != "All" and entry['direction'] != direction_filter:
-            return False
-        
-        return True
+    def filter_entries(self) -> Iterable[Dict]:
+        """Yield the stored entries passing the direction filter"""
+        if self.filter_code is None:
+            return iter(self.log_entries)
+        
+        # Build a 0/1 mask over the direction codes and select with it, both in C
+        mask = self.log_directions.translate(_CODE_MASKS[self.filter_code])
+        return compress(self.log_entries, mask)
 
     def on_filter_changed(self, event=None):
         """Handle filter changes"""
+        self.filter_direction = self.direction_filter.get()
+        if self.filter_direction == "All":
+            self.filter_code = None
+        else:
+            self.filter_code = _DIRECTION_CODES.get(self.filter_direction, _OTHER_DIRECTION)
         self.refresh_log_display()
 
+    def on_format_changed(self):
+        """Handle format changes; the filtered entries stay the same"""
+        self.format_type = self.format_var.get()
+        self.render_log_window()
+
     def refresh_log_display(self):
-        """Refresh the entire log display"""
+        """Re-filter the stored entries and render the newest window"""
+        self._filtered_entries = deque(self.filter_entries())
+        self._follow_tail = True
+        self.render_log_window()
+
+    def render_log_window(self):
+        """Render only the filtered entries that fit in the text widget"""
+        self._needs_render = False
+        total = len(self._filtered_entries)
+        max_start = max(total - self._visible_rows, 0)
+        if self._follow_tail:
+            self._view_start = max_start
+        else:
+            self._view_start = min(self._view_start, max_start)
+        
         self.log_text.config(state=tk.NORMAL)
         self.log_text.delete(1.0, tk.END)
         
-        for entry in self.log_entries:
-            self.add_log_line(entry)
+        end = self._view_start + self._visible_rows
+        self._rendered_lines = deque()
+        self.insert_log_lines(islice(self._filtered_entries, self._view_start, end))
         
         self.log_text.config(state=tk.DISABLED)
+        if self._follow_tail:
+            self.schedule_see_end()
+        self.update_log_scrollbar()
+
+    def schedule_see_end(self):
+        """Coalesce auto-scroll requests into one see() per idle pass"""
+        if not self._see_pending:
+            self._see_pending = True
+            self.frame.after_idle(self._see_end)
+
+    def _see_end(self):
+        """Scroll the text widget to its last line if still following the tail"""
+        self._see_pending = False
+        if self._follow_tail:
+            self.log_text.see(tk.END)
+
+    def update_log_scrollbar(self):
+        """Position the scrollbar to reflect the rendered window"""
+        total = len(self._filtered_entries)
+        if total == 0:
+            self.log_scrollbar.set(0.0, 1.0)
+            return
+        
+        last = min(self._view_start + len(self._rendered_lines), total)
+        self.log_scrollbar.set(self._view_start / total, last / total)
+
+    def scroll_log(self, rows: int):
+        """Move the rendered window by a number of entries"""
+        max_start = max(len(self._filtered_entries) - self._visible_rows, 0)
+        start = min(max(self._view_start + rows, 0), max_start)
+        self._follow_tail = start >= max_start
+        if start != self._view_start or self._follow_tail:
+            self._view_start = start
+            self.render_log_window()
+
+    def on_log_scroll(self, *args):
+        """Handle scrollbar drags and clicks"""
+        if args[0] == 'moveto':
+            start = int(float(args[1]) * len(self._filtered_entries))
+            self.scroll_log(start - self._view_start)
+        elif args[0] == 'scroll':
+            step = self._visible_rows if args[2] == 'pages' else 1
+            self.scroll_log(int(args[1]) * step)
+
+    def on_log_wheel(self, event):
+        """Scroll the rendered window with the mouse wheel"""
+        if event.num == 4 or getattr(event, 'delta', 0) > 0:
+            self.scroll_log(-3)
+        else:
+            self.scroll_log(3)
+        return "break"
+
+    def on_log_resized(self, event):
+        """Recompute how many entries fit when the text widget is resized"""
+        rows = max(event.height // self.log_line_height, 1)
+        if rows != self._visible_rows:
+            self._visible_rows = rows
+            self.render_log_window()
 
     def clear_logs(self):
         """Clear all log entries"""
-        with self.update_lock:
-            self.log_entries.clear()
-            self.log_text.config(state=tk.NORMAL)
-            self.log_text.delete(1.0, tk.END)
-            self.log_text.config(state=tk.DISABLED)
+        self.log_entries.clear()
+        self.log_directions.clear()
+        self._filtered_entries.clear()
+        self._follow_tail = True
+        self.render_log_window()
 
     def toggle_pause(self):
         """Toggle pause state"""
         self.paused = not self.paused
         # Update button text would go here if we had a reference to it
 
+    def set_label(self, label, text: str, foreground: str = None):
+        """Configure a label only if its text or color actually changed"""
+        state = (text, foreground)
+        if self._label_cache.get(label) == state:
+            return
+        self._label_cache[label] = state
+        if foreground is None:
+            label.config(text=text)
+        else:
+            label.config(text=text, foreground=foreground)
+
     def update_display(self):
         """Update statistics display"""
+        set_label = self.set_label
+        
         # Update connection status
         if self.serial_manager.is_connected:
-            self.port_a_status.config(text="Connected", foreground="green")
-            self.port_b_status.config(text="Connected", foreground="green")
+            set_label(self.port_a_status, "Connected", "green")
+            set_label(self.port_b_status, "Connected", "green")
         else:
-            self.port_a_status.config(text="Disconnected", foreground="red")
-            self.port_b_status.config(text="Disconnected", foreground="red")
+            set_label(self.port_a_status, "Disconnected", "red")
+            set_label(self.port_b_status, "Disconnected", "red")
         
         if self.serial_manager.is_monitoring:
-            self.monitoring_status.config(text="Active", foreground="green")
+            set_label(self.monitoring_status, "Active", "green")
         else:
-            self.monitoring_status.config(text="Stopped", foreground="red")
+            set_label(self.monitoring_status, "Stopped", "red")
         
         # Update statistics
         stats = self.serial_manager.get_statistics()
         
-        self.stats_a_to_b.config(text=str(stats.get('messages_a_to_b', 0)))
-        self.stats_b_to_a.config(text=str(stats.get('messages_b_to_a', 0)))
+        messages_a_to_b = stats.get('messages_a_to_b', 0)
+        messages_b_to_a = stats.get('messages_b_to_a', 0)
+        set_label(self.stats_a_to_b, str(messages_a_to_b))
+        set_label(self.stats_b_to_a, str(messages_b_to_a))
         
+        total_messages = messages_a_to_b + messages_b_to_a
         total_bytes = stats.get('bytes_a_to_b', 0) + stats.get('bytes_b_to_a', 0)
-        self.stats_total_bytes.config(text=str(total_bytes))
+        set_label(self.stats_total_bytes, str(total_bytes))
         
         # Get logger statistics for spoofed count
         logger_stats = self.logger.get_statistics()
-        self.stats_spoofed.config(text=str(logger_stats.get('spoofed_messages', 0)))
+        set_label(self.stats_spoofed, str(logger_stats.get('spoofed_messages', 0)))
         
         # Calculate rates
         runtime = stats.get('runtime_seconds', 0)
         if runtime > 0:
-            msg_per_sec = (stats.get('messages_a_to_b', 0) + stats.get('messages_b_to_a', 0)) / runtime
+            msg_per_sec = total_messages / runtime
             bytes_per_sec = total_bytes / runtime
-            self.stats_msg_per_sec.config(text=f"{msg_per_sec:.1f}")
-            self.stats_bytes_per_sec.config(text=f"{bytes_per_sec:.1f}")
+            set_label(self.stats_msg_per_sec, f"{msg_per_sec:.1f}")
+            set_label(self.stats_bytes_per_sec, f"{bytes_per_sec:.1f}")
         
         # Format runtime
         if runtime > 0:
-            hours = int(runtime // 3600)
-            minutes = int((runtime % 3600) // 60)
-            seconds = int(runtime % 60)
-            self.stats_runtime.config(text=f"{hours:02d}:{minutes:02d}:{seconds:02d}")
+            hours, remainder = divmod(int(runtime), 3600)
+            minutes, seconds = divmod(remainder, 60)
+            set_label(self.stats_runtime, f"{hours:02d}:{minutes:02d}:{seconds:02d}")
 
     def reset_statistics(self):
         """Reset statistics display"""
-        self.stats_a_to_b.config(text="0")
-        self.stats_b_to_a.config(text="0")
-        self.stats_total_bytes.config(text="0")
-        self.stats_spoofed.config(text="0")
-        self.stats_msg_per_sec.config(text="0.0")
-        self.stats_bytes_per_sec.config(text="0.0")
-        self.stats_runtime.config(text="00:00:00")
-        self.stats_error_rate.config(text="0.0%")
+        self.set_label(self.stats_a_to_b, "0")
+        self.set_label(self.stats_b_to_a, "0")
+        self.set_label(self.stats_total_bytes, "0")
+        self.set_label(self.stats_spoofed, "0")
+        self.set_label(self.stats_msg_per_sec, "0.0")
+        self.set_label(self.stats_bytes_per_sec, "0.0")
+        self.set_label(self.stats_runtime, "00:00:00")
+        self.set_label(self.stats_error_rate, "0.0%")
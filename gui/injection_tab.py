@@ -5,8 +5,14 @@ Allows manual sending of data to either port
 
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
+from collections import deque
+import csv
 from datetime import datetime
-import threading
+import re
+
+# Hex input cleanup and validation
+_WHITESPACE = re.compile(r'\s+')
+_HEX_DIGITS = re.compile(r'[0-9A-Fa-f]*')
 
 class InjectionTab:
     def __init__(self, parent_notebook, serial_manager):
@@ -17,8 +23,10 @@ class InjectionTab:
         parent_notebook.add(self.frame, text="Manual Injection")
         
         # History storage
-        self.injection_history = []
         self.max_history = 100
+        self.injection_history = deque(maxlen=self.max_history)
+        self._history_ids = deque(maxlen=self.max_history)  # tree rows, newest first
+        self._status_clear_job = None
         
         self.setup_ui()
 
@@ -85,6 +93,9 @@ class InjectionTab:
         ttk.Button(button_frame, text="Clear", command=self.clear_input).pack(side=tk.LEFT, padx=2)
         ttk.Button(button_frame, text="Load from History", command=self.load_from_history).pack(side=tk.LEFT, padx=10)
         
+        self.status_label = ttk.Label(button_frame, text="")
+        self.status_label.pack(side=tk.LEFT, padx=10)
+        
         # Quick send buttons
         quick_frame = ttk.LabelFrame(parent, text="Quick Send")
         quick_frame.pack(fill=tk.X, padx=5, pady=5)
@@ -121,6 +132,10 @@ class InjectionTab:
         self.history_tree.column('Data', width=200)
         self.history_tree.column('Status', width=60)
         
+        # Color coding for the status column
+        self.history_tree.tag_configure('success', foreground='green')
+        self.history_tree.tag_configure('error', foreground='red')
+        
         history_scrollbar = ttk.Scrollbar(history_frame, orient=tk.VERTICAL, command=self.history_tree.yview)
         self.history_tree.configure(yscrollcommand=history_scrollbar.set)
         
@@ -164,10 +179,12 @@ class InjectionTab:
             if format_type == "ascii":
                 data = input_text.encode('utf-8')
             else:  # hex
-                # Remove spaces and convert hex to bytes
-                hex_string = input_text.replace(' ', '').replace('\n', '').replace('\t', '')
+                # Remove whitespace and convert hex to bytes
+                hex_string = _WHITESPACE.sub('', input_text)
                 if len(hex_string) % 2 != 0:
                     raise ValueError("Hex string must have even number of characters")
+                if not _HEX_DIGITS.fullmatch(hex_string):
+                    raise ValueError("Hex string contains non-hex characters")
                 data = bytes.fromhex(hex_string)
             
             # Send data
@@ -176,8 +193,8 @@ class InjectionTab:
             # Add to history
             self.add_to_history(target, format_type, input_text, "Sent")
             
-            # Show success message
-            messagebox.showinfo("Success", f"Data sent to Port {target}")
+            # Show success without blocking on a dialog
+            self.show_status(f"Sent to Port {target}", 'green')
             
         except ValueError as e:
             messagebox.showerror("Format Error", f"Invalid data format: {str(e)}")
@@ -185,6 +202,18 @@ class InjectionTab:
             messagebox.showerror("Send Error", f"Failed to send data: {str(e)}")
             self.add_to_history(target, format_type, input_text, "Failed")
 
+    def show_status(self, text: str, foreground: str):
+        """Show a transient status message next to the send buttons"""
+        if self._status_clear_job:
+            self.frame.after_cancel(self._status_clear_job)
+        self.status_label.config(text=text, foreground=foreground)
+        self._status_clear_job = self.frame.after(2000, self.clear_status)
+
+    def clear_status(self):
+        """Clear the status message"""
+        self._status_clear_job = None
+        self.status_label.config(text="")
+
     def quick_send(self, data: str):
         """Quick send common control characters"""
         if not self.serial_manager.is_connected:
@@ -243,21 +272,17 @@ class InjectionTab:
         # Create history entry
         entry = {
             'timestamp': timestamp,
+            'time_str': timestamp.strftime("%H:%M:%S"),
             'port': port,
             'format': format_type,
             'data': data,
             'status': status
         }
         
-        # Add to storage
+        # Add to storage; the deque drops the oldest entry once full
         self.injection_history.append(entry)
         
-        # Limit history size
-        if len(self.injection_history) > self.max_history:
-            self.injection_history.pop(0)
-        
         # Add to tree
-        time_str = timestamp.strftime("%H:%M:%S")
         data_preview = data[:50] + "..." if len(data) > 50 else data
         
         # Color coding
@@ -266,18 +291,14 @@ class InjectionTab:
         else:
             tags = ('error',)
         
-        self.history_tree.insert('', 0, values=(
-            time_str, port, format_type.upper(), data_preview, status
-        ), tags=tags)
-        
-        # Configure tags
-        self.history_tree.tag_configure('success', foreground='green')
-        self.history_tree.tag_configure('error', foreground='red')
+        # Limit tree items by dropping the oldest row
+        if len(self._history_ids) == self._history_ids.maxlen:
+            self.history_tree.delete(self._history_ids.pop())
         
-        # Limit tree items
-        children = self.history_tree.get_children()
-        if len(children) > self.max_history:
-            self.history_tree.delete(children[-1])
+        item_id = self.history_tree.insert('', 0, values=(
+            entry['time_str'], port, format_type.upper(), data_preview, status
+        ), tags=tags)
+        self._history_ids.appendleft(item_id)
 
     def clear_history(self):
         """Clear injection history"""
@@ -285,8 +306,9 @@ class InjectionTab:
             self.injection_history.clear()
             
             # Clear tree
-            for item in self.history_tree.get_children():
-                self.history_tree.delete(item)
+            if self._history_ids:
+                self.history_tree.delete(*self._history_ids)
+                self._history_ids.clear()
 
     def export_history(self):
         """Export injection history"""
@@ -296,7 +318,6 @@ class InjectionTab:
         
         try:
             from tkinter import filedialog
-            import csv
             
             filename = filedialog.asksaveasfilename(
                 title="Export Injection History",
@@ -312,14 +333,13 @@ class InjectionTab:
                     writer.writerow(['Timestamp', 'Port', 'Format', 'Data', 'Status'])
                     
                     # Write data
-                    for entry in self.injection_history:
-                        writer.writerow([
-                            entry['timestamp'].strftime('%Y-%m-%d %H:%M:%S'),
-                            entry['port'],
-                            entry['format'],
-                            entry['data'],
-                            entry['status']
-                        ])
+                    writer.writerows([
+                        entry['timestamp'].strftime('%Y-%m-%d %H:%M:%S'),
+                        entry['port'],
+                        entry['format'],
+                        entry['data'],
+                        entry['status']
+                    ] for entry in self.injection_history)
                 
                 messagebox.showinfo("Export Complete", f"History exported to {filename}")
                 
@@ -19,6 +19,11 @@ from .injection_tab import InjectionTab
 from .settings_tab import SettingsTab
 from .protocol_tab import ProtocolTab
 
+# Config keys each part of apply_config depends on
+_SERIAL_KEYS = frozenset({'port_a', 'port_b', 'baud_rate', 'timeout'})
+_LOGGER_KEYS = frozenset({'log_folder', 'log_format'})
+_RULES_KEYS = frozenset({'spoofing_rules'})
+
 class MainWindow:
     def __init__(self):
         self.root = tk.Tk()
@@ -30,6 +35,22 @@ class MainWindow:
         self.logger = DataLogger()
         self.config_manager = ConfigManager()
         
+        # Tabs are created in setup_ui; callbacks may fire before that
+        self.dashboard_tab = None
+        self.protocol_tab = None
+        self.rules_tab = None
+        self.injection_tab = None
+        self.settings_tab = None
+        
+        # Periodic refreshes only run for tabs with new data
+        self._dirty_dashboard = True
+        self._dirty_protocol = True
+        self._last_status = None
+        self._last_connected = None
+        
+        # Status set from the monitor thread, shown by update_timer
+        self._pending_status = None
+        
         # Load configuration
         self.config = self.config_manager.load_config()
         self.apply_config()
@@ -112,50 +133,70 @@ class MainWindow:
         self.connection_label = ttk.Label(self.status_frame, text="Disconnected", foreground="red")
         self.connection_label.pack(side=tk.RIGHT, padx=5)
 
-    def apply_config(self):
-        """Apply loaded configuration"""
-        self.serial_manager.configure_ports(
-            self.config.get('port_a', '/dev/ttyUSB0'),
-            self.config.get('port_b', '/dev/ttyUSB1'),
-            self.config.get('baud_rate', 9600),
-            self.config.get('timeout', 1.0)
-        )
+    def apply_config(self, changed=None):
+        """Apply loaded configuration, or only the parts that depend on changed keys"""
+        if changed is None or not _SERIAL_KEYS.isdisjoint(changed):
+            self.serial_manager.configure_ports(
+                self.config.get('port_a', '/dev/ttyUSB0'),
+                self.config.get('port_b', '/dev/ttyUSB1'),
+                self.config.get('baud_rate', 9600),
+                self.config.get('timeout', 1.0)
+            )
         
-        self.logger.configure(
-            self.config.get('log_folder', './logs'),
-            self.config.get('log_format', 'both')
-        )
+        if changed is None or not _LOGGER_KEYS.isdisjoint(changed):
+            self.logger.configure(
+                self.config.get('log_folder', './logs'),
+                self.config.get('log_format', 'both')
+            )
         
         # Apply spoofing rules
-        rules = self.config.get('spoofing_rules', [])
-        self.serial_manager.set_spoofing_rules(rules)
+        if changed is None or not _RULES_KEYS.isdisjoint(changed):
+            rules = self.config.get('spoofing_rules', [])
+            self.serial_manager.set_spoofing_rules(rules)
 
-    def on_config_changed(self, config):
-        """Handle configuration changes"""
+    def on_config_changed(self, config, changed=None):
+        """Handle configuration changes; changed holds the keys that differ, if known"""
         self.config = config
-        self.apply_config()
+        self.apply_config(changed)
         self.config_manager.save_config(config)
 
     def on_data_received(self, data, direction, timestamp, modified_data=None, spoofed=False):
-        """Handle received data"""
+        """Handle received data (monitor thread); only queues work for other threads"""
         # Log the data
         self.logger.log_data(data, direction, timestamp, modified_data, spoofed)
         
         # Update dashboard
-        if hasattr(self, 'dashboard_tab'):
+        if self.dashboard_tab is not None:
             self.dashboard_tab.add_log_entry(data, direction, timestamp, modified_data, spoofed)
+            self._dirty_dashboard = True
 
     def on_protocol_message(self, message: ParsedMessage, direction: str):
-        """Handle parsed protocol message"""
-        if hasattr(self, 'protocol_tab'):
+        """Handle parsed protocol message (monitor thread); drained by update_timer"""
+        if self.protocol_tab is not None:
             self.protocol_tab.add_message(message, direction)
+            self._dirty_protocol = True
 
     def on_status_changed(self, status):
-        """Handle status changes"""
-        self.status_label.config(text=status)
+        """Handle status changes from the GUI or the monitor thread"""
+        self._dirty_dashboard = True
+        if threading.current_thread() is threading.main_thread():
+            self.show_status(status)
+        else:
+            # Tk is not thread-safe; update_timer shows it on the Tk thread
+            self._pending_status = status
+
+    def show_status(self, status):
+        """Show a status message and the current connection state"""
+        if status != self._last_status:
+            self._last_status = status
+            self.status_label.config(text=status)
         
-        # Update connection status
-        if self.serial_manager.is_connected:
+        # Update connection status only when it changes
+        is_connected = self.serial_manager.is_connected
+        if is_connected == self._last_connected:
+            return
+        self._last_connected = is_connected
+        if is_connected:
             self.connection_label.config(text="Connected", foreground="green")
         else:
             self.connection_label.config(text="Disconnected", foreground="red")
@@ -188,15 +229,15 @@ class MainWindow:
         """Reset all statistics"""
         if messagebox.askyesno("Reset Statistics", "Reset all statistics and protocol data?"):
             self.serial_manager.reset_statistics()
-            if hasattr(self, 'protocol_tab'):
+            if self.protocol_tab is not None:
                 self.protocol_tab.reset_statistics()
-            if hasattr(self, 'dashboard_tab'):
+            if self.dashboard_tab is not None:
                 self.dashboard_tab.reset_statistics()
 
     def clear_logs(self):
         """Clear log displays"""
         if messagebox.askyesno("Clear Logs", "Clear all log displays?"):
-            if hasattr(self, 'dashboard_tab'):
+            if self.dashboard_tab is not None:
                 self.dashboard_tab.clear_logs()
 
     def export_logs(self):
@@ -216,7 +257,7 @@ class MainWindow:
 
     def export_protocol_stats(self):
         """Export protocol statistics"""
-        if hasattr(self, 'protocol_tab'):
+        if self.protocol_tab is not None:
             self.protocol_tab.export_statistics()
 
     def show_about(self):
@@ -240,10 +281,17 @@ Python 3 with Tkinter GUI"""
 
     def update_timer(self):
         """Update timer for periodic tasks"""
-        # Update displays
-        if hasattr(self, 'dashboard_tab'):
+        status = self._pending_status
+        if status is not None:
+            self._pending_status = None
+            self.show_status(status)
+        
+        # Update displays; the dashboard runtime keeps ticking while monitoring
+        if self.dashboard_tab is not None and (self._dirty_dashboard or self.serial_manager.is_monitoring):
+            self._dirty_dashboard = False
             self.dashboard_tab.update_display()
-        if hasattr(self, 'protocol_tab'):
+        if self.protocol_tab is not None and self._dirty_protocol:
+            self._dirty_protocol = False
             self.protocol_tab.update_display()
         
         # Schedule next update
@@ -255,9 +303,11 @@ Python 3 with Tkinter GUI"""
             if messagebox.askyesno("Exit", "Monitoring is active. Stop monitoring and exit?"):
                 self.serial_manager.stop_monitoring_ports()
                 self.serial_manager.disconnect()
+                self.logger.close()
                 self.root.destroy()
         else:
             self.serial_manager.disconnect()
+            self.logger.close()
             self.root.destroy()
 
     def run(self):
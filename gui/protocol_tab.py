@@ -5,12 +5,18 @@ Displays parsed protocol information and statistics
 
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
-from typing import Dict, List
+from typing import Deque, Dict, List, Tuple
+from collections import deque
 import json
+import threading
 from datetime import datetime
 
 from core.protocol_parser import ProtocolType, ParsedMessage, ProtocolStatistics
 
+# Enum members in display order, and lookup by their combobox value
+_PROTOCOL_TYPES = tuple(ProtocolType)
+_PROTOCOL_BY_VALUE = {protocol.value: protocol for protocol in _PROTOCOL_TYPES}
+
 class ProtocolTab:
     def __init__(self, parent_notebook, serial_manager, logger):
         self.serial_manager = serial_manager
@@ -22,7 +28,6 @@ class ProtocolTab:
         parent_notebook.add(self.frame, text="Protocol Analysis")
         
         self.setup_ui()
-        self.update_display()
     
     def setup_ui(self):
         """Setup the protocol analysis UI"""
@@ -56,7 +61,7 @@ class ProtocolTab:
         ttk.Label(protocol_frame, text="Force Protocol:").pack(anchor=tk.W, padx=5, pady=(10,2))
         self.protocol_var = tk.StringVar(value=ProtocolType.RAW.value)
         protocol_combo = ttk.Combobox(protocol_frame, textvariable=self.protocol_var,
-                                     values=[p.value for p in ProtocolType],
+                                     values=list(_PROTOCOL_BY_VALUE),
                                      state="readonly")
         protocol_combo.pack(fill=tk.X, padx=5, pady=2)
         protocol_combo.bind('<<ComboboxSelected>>', self.on_protocol_changed)
@@ -78,6 +83,9 @@ class ProtocolTab:
         self.stats_tree.column('Bytes', width=80)
         self.stats_tree.column('Errors', width=60)
         
+        # Values currently shown per statistics row iid
+        self._stats_row_values: Dict[str, Tuple[int, int, int]] = {}
+        
         stats_scrollbar = ttk.Scrollbar(stats_frame, orient=tk.VERTICAL, command=self.stats_tree.yview)
         self.stats_tree.configure(yscrollcommand=stats_scrollbar.set)
         
@@ -124,6 +132,10 @@ class ProtocolTab:
         
         self.message_tree.bind('<<TreeviewSelect>>', self.on_message_selected)
         
+        # Configure tags
+        self.message_tree.tag_configure('valid', foreground='green')
+        self.message_tree.tag_configure('invalid', foreground='red')
+        
         # Message details
         details_frame = ttk.LabelFrame(parent, text="Message Details")
         details_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -136,19 +148,30 @@ class ProtocolTab:
         parsed_frame = ttk.Frame(details_notebook)
         details_notebook.add(parsed_frame, text="Parsed Data")
         
-        self.parsed_text = scrolledtext.ScrolledText(parsed_frame, height=8, wrap=tk.WORD)
+        self.parsed_text = scrolledtext.ScrolledText(parsed_frame, height=8, wrap=tk.WORD, undo=False,
+                                                     autoseparators=False, state=tk.DISABLED)
         self.parsed_text.pack(fill=tk.BOTH, expand=True)
         
         # Raw data tab
         raw_frame = ttk.Frame(details_notebook)
         details_notebook.add(raw_frame, text="Raw Data")
         
-        self.raw_text = scrolledtext.ScrolledText(raw_frame, height=8, wrap=tk.WORD, font=('Courier', 9))
+        self.raw_text = scrolledtext.ScrolledText(raw_frame, height=8, wrap=tk.WORD, font=('Courier', 9),
+                                                  undo=False, autoseparators=False, state=tk.DISABLED)
         self.raw_text.pack(fill=tk.BOTH, expand=True)
         
         # Store recent messages
-        self.recent_messages: List[ParsedMessage] = []
         self.max_recent_messages = 1000
+        self.recent_messages: Deque[ParsedMessage] = deque(maxlen=self.max_recent_messages)
+        self._iid_to_message: Dict[str, ParsedMessage] = {}
+        
+        # Ping-pong buffers: the serial thread appends to the pending list while
+        # update_display swaps in the spare one and processes the full one.
+        # SerialManager serves both ports from one monitor thread, so the lock
+        # is only ever shared with the Tk thread's swap.
+        self._pending_lock = threading.Lock()
+        self._pending_messages: List[Tuple[ParsedMessage, str]] = []
+        self._spare_messages: List[Tuple[ParsedMessage, str]] = []
     
     def on_auto_detect_changed(self):
         """Handle auto-detect checkbox change"""
@@ -171,136 +194,146 @@ class ProtocolTab:
         if not selection:
             return
         
-        item_id = selection[0]
-        try:
-            index = int(self.message_tree.item(item_id)['values'][0])  # Hidden index
-            if 0 <= index < len(self.recent_messages):
-                self.display_message_details(self.recent_messages[index])
-        except (ValueError, IndexError):
-            pass
+        message = self._iid_to_message.get(selection[0])
+        if message is not None:
+            self.display_message_details(message)
     
     def add_message(self, message: ParsedMessage, direction: str):
-        """Add a new parsed message to the display"""
-        # Add to recent messages
-        self.recent_messages.append(message)
-        if len(self.recent_messages) > self.max_recent_messages:
-            self.recent_messages.pop(0)
-        
-        # Update statistics
-        self.statistics.update(message)
-        
-        # Add to tree
-        time_str = message.timestamp.strftime("%H:%M:%S")
-        valid_str = "✓" if message.is_valid else "✗"
-        
-        # Color coding
-        if message.is_valid:
-            tags = ('valid',)
-        else:
-            tags = ('invalid',)
+        """Queue a new parsed message; safe to call from any thread"""
+        with self._pending_lock:
+            self._pending_messages.append((message, direction))
+    
+    def drain_messages(self):
+        """Add queued messages to the statistics and message tree in one batch"""
+        with self._pending_lock:
+            batch = self._pending_messages
+            self._pending_messages = self._spare_messages
+        self._spare_messages = batch
+        if not batch:
+            return
         
-        self.message_tree.insert('', 0, values=(
-            len(self.recent_messages) - 1,  # Hidden index
-            time_str,
-            direction,
-            message.protocol.value,
-            message.description,
-            valid_str
-        ), tags=tags)
+        # Every message is counted, but only the newest ones can stay in the tree
+        for message, _ in batch:
+            self.statistics.update(message)
         
-        # Configure tags
-        self.message_tree.tag_configure('valid', foreground='green')
-        self.message_tree.tag_configure('invalid', foreground='red')
+        for message, direction in batch[-self.max_recent_messages:]:
+            self.recent_messages.append(message)
+            
+            # Add to tree
+            time_str = message.timestamp_str[11:19]  # HH:MM:SS
+            valid_str = "✓" if message.is_valid else "✗"
+            
+            # Color coding
+            if message.is_valid:
+                tags = ('valid',)
+            else:
+                tags = ('invalid',)
+            
+            item_id = self.message_tree.insert('', 0, values=(
+                time_str,
+                direction,
+                message.protocol.value,
+                message.description,
+                valid_str
+            ), tags=tags)
+            self._iid_to_message[item_id] = message
         
         # Limit tree items
         children = self.message_tree.get_children()
         if len(children) > self.max_recent_messages:
-            self.message_tree.delete(children[-1])
+            stale = children[self.max_recent_messages:]
+            self.message_tree.delete(*stale)
+            for item_id in stale:
+                del self._iid_to_message[item_id]
+        
+        batch.clear()
         
         # Update statistics display
         self.update_statistics_display()
     
     def display_message_details(self, message: ParsedMessage):
         """Display detailed information about a message"""
-        # Clear previous content
-        self.parsed_text.delete(1.0, tk.END)
-        self.raw_text.delete(1.0, tk.END)
-        
         # Display parsed data
-        parsed_info = f"Protocol: {message.protocol.value}\n"
-        parsed_info += f"Timestamp: {message.timestamp.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}\n"
-        parsed_info += f"Valid: {'Yes' if message.is_valid else 'No'}\n"
+        parsed_info = [
+            f"Protocol: {message.protocol.value}\n",
+            f"Timestamp: {message.timestamp_str}\n",
+            f"Valid: {'Yes' if message.is_valid else 'No'}\n",
+        ]
         
         if message.error_message:
-            parsed_info += f"Error: {message.error_message}\n"
+            parsed_info.append(f"Error: {message.error_message}\n")
         
-        parsed_info += f"Description: {message.description}\n\n"
+        parsed_info.append(f"Description: {message.description}\n\n")
         
         if message.parsed_data:
-            parsed_info += "Parsed Fields:\n"
-            for key, value in message.parsed_data.items():
-                parsed_info += f"  {key}: {value}\n"
-        
-        self.parsed_text.insert(tk.END, parsed_info)
-        
-        # Display raw data
-        raw_info = f"Length: {len(message.raw_data)} bytes\n\n"
-        raw_info += "Hexadecimal:\n"
+            parsed_info.append("Parsed Fields:\n")
+            parsed_info += [f"  {key}: {value}\n" for key, value in message.parsed_data.items()]
         
-        # Format hex dump
-        hex_data = message.raw_data
-        for i in range(0, len(hex_data), 16):
-            chunk = hex_data[i:i+16]
-            hex_str = ' '.join(f'{b:02X}' for b in chunk)
-            ascii_str = ''.join(chr(b) if 32 <= b <= 126 else '.' for b in chunk)
-            raw_info += f"{i:04X}: {hex_str:<48} |{ascii_str}|\n"
+        self.set_text(self.parsed_text, ''.join(parsed_info))
         
-        raw_info += "\nASCII (if printable):\n"
-        try:
-            ascii_text = message.raw_data.decode('ascii', errors='replace')
-            raw_info += ascii_text
-        except:
-            raw_info += "(Not valid ASCII)"
+        # Display raw data; the hex dump is formatted once per message and cached
+        raw_info = [
+            f"Length: {len(message.raw_data)} bytes\n\n",
+            "Hexadecimal:\n",
+            message.hex_dump,
+            "\nASCII (if printable):\n",
+            message.raw_data.decode('ascii', errors='replace'),
+        ]
         
-        self.raw_text.insert(tk.END, raw_info)
+        self.set_text(self.raw_text, ''.join(raw_info))
+    
+    def set_text(self, widget, text: str):
+        """Replace a read-only text widget's content in one edit cycle"""
+        widget.configure(state=tk.NORMAL)
+        widget.delete(1.0, tk.END)
+        if text:
+            widget.insert(tk.END, text)
+        widget.configure(state=tk.DISABLED)
     
     def update_statistics_display(self):
-        """Update the statistics tree display"""
-        # Clear existing items
-        for item in self.stats_tree.get_children():
-            self.stats_tree.delete(item)
+        """Update the statistics tree, touching only rows whose counts changed"""
+        position = 0
+        totals = [0, 0, 0]
         
         # Add protocol statistics
-        for protocol in ProtocolType:
-            messages = self.statistics.message_counts[protocol]
-            bytes_count = self.statistics.byte_counts[protocol]
-            errors = self.statistics.error_counts[protocol]
+        for protocol in _PROTOCOL_TYPES:
+            counts = self.statistics.get_counts(protocol)
+            totals[0] += counts[0]
+            totals[1] += counts[1]
+            totals[2] += counts[2]
             
-            if messages > 0:  # Only show protocols with activity
-                self.stats_tree.insert('', tk.END, text=protocol.value,
-                                     values=(messages, bytes_count, errors))
+            if counts[0] > 0:  # Only show protocols with activity
+                self.set_stats_row(protocol.name, position, protocol.value, counts)
+                position += 1
         
         # Add totals
-        summary = self.statistics.get_summary()
-        self.stats_tree.insert('', tk.END, text="TOTAL",
-                             values=(summary['total_messages'], 
-                                   summary['total_bytes'],
-                                   summary['total_errors']))
+        self.set_stats_row('TOTAL', tk.END, "TOTAL", tuple(totals))
+    
+    def set_stats_row(self, iid: str, position, text: str, values: Tuple[int, int, int]):
+        """Insert a statistics row or update its values if they changed"""
+        previous = self._stats_row_values.get(iid)
+        if previous is None:
+            self.stats_tree.insert('', position, iid=iid, text=text, values=values)
+        elif previous != values:
+            self.stats_tree.item(iid, values=values)
+        self._stats_row_values[iid] = values
     
     def reset_statistics(self):
         """Reset all statistics"""
         if messagebox.askyesno("Reset Statistics", "Are you sure you want to reset all statistics?"):
             self.statistics.reset()
             self.recent_messages.clear()
+            self._iid_to_message.clear()
             
             # Clear displays
             for item in self.stats_tree.get_children():
                 self.stats_tree.delete(item)
+            self._stats_row_values.clear()
             for item in self.message_tree.get_children():
                 self.message_tree.delete(item)
             
-            self.parsed_text.delete(1.0, tk.END)
-            self.raw_text.delete(1.0, tk.END)
+            self.set_text(self.parsed_text, "")
+            self.set_text(self.raw_text, "")
     
     def export_statistics(self):
         """Export statistics to JSON file"""
@@ -315,23 +348,23 @@ class ProtocolTab:
             
             if filename:
                 summary = self.statistics.get_summary()
+                # JSON object keys must be strings, not enum members
+                summary['protocol_breakdown'] = {protocol.value: count for protocol, count
+                                                 in summary['protocol_breakdown'].items()}
                 
                 # Add detailed breakdown
                 export_data = {
                     'export_time': datetime.now().isoformat(),
                     'summary': summary,
-                    'protocol_details': {}
-                }
-                
-                for protocol in ProtocolType:
-                    export_data['protocol_details'][protocol.value] = {
-                        'messages': self.statistics.message_counts[protocol],
-                        'bytes': self.statistics.byte_counts[protocol],
-                        'errors': self.statistics.error_counts[protocol]
+                    'protocol_details': {
+                        protocol.value: dict(zip(('messages', 'bytes', 'errors'),
+                                                 self.statistics.get_counts(protocol)))
+                        for protocol in _PROTOCOL_TYPES
                     }
+                }
                 
-                with open(filename, 'w') as f:
-                    json.dump(export_data, f, indent=2)
+                with open(filename, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                    json.dump(export_data, f, ensure_ascii=False, separators=(',', ':'))
                 
                 messagebox.showinfo("Export Complete", f"Statistics exported to {filename}")
         
@@ -345,17 +378,13 @@ class ProtocolTab:
         pass
     
     def update_display(self):
-        """Update the display (called periodically)"""
-        # This method can be called periodically to refresh the display
-        pass
+        """Update the display (called periodically by MainWindow's update timer)"""
+        # The single drain point: new messages only reach the widgets from here
+        self.drain_messages()
     
     def get_current_protocol(self) -> ProtocolType:
         """Get the currently selected protocol"""
         if self.auto_detect_var.get():
             return None  # Auto-detect
         else:
-            protocol_name = self.protocol_var.get()
-            for protocol in ProtocolType:
-                if protocol.value == protocol_name:
-                    return protocol
-            return ProtocolType.RAW
+            return _PROTOCOL_BY_VALUE.get(self.protocol_var.get(), ProtocolType.RAW)
@@ -6,7 +6,52 @@ Manages message modification rules
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import json
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
+
+from core.serial_manager import hex_to_bytes
+
+# orjson is optional; fall back to the standard library when unavailable
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _match_key(rule: Dict[str, Any]) -> tuple:
+    """Return the fields of a rule that affect matching in the serial manager"""
+    return (rule.get('type', 'ascii'), rule.get('pattern', ''),
+            rule.get('replacement', ''), rule.get('enabled', True))
+
+def _normalize_rule(rule: Any) -> Optional[Dict[str, Any]]:
+    """Return an imported rule in the editor's shape, or None if it is malformed"""
+    if not isinstance(rule, dict):
+        return None
+    
+    description = rule.get('description')
+    rule_type = rule.get('type', 'ascii')
+    pattern = rule.get('pattern')
+    replacement = rule.get('replacement', '')
+    if not isinstance(description, str) or not isinstance(pattern, str) or not pattern:
+        return None
+    if rule_type not in ('ascii', 'hex') or not isinstance(replacement, str):
+        return None
+    
+    # Parse hex now so a bad import is caught here rather than by the serial manager
+    if rule_type == 'hex':
+        try:
+            hex_to_bytes(pattern)
+            if replacement:
+                hex_to_bytes(replacement)
+        except ValueError:
+            return None
+    
+    return {
+        'description': description,
+        'type': rule_type,
+        'pattern': pattern,
+        'replacement': replacement,
+        'enabled': bool(rule.get('enabled', True))
+    }
 
 class RulesTab:
     def __init__(self, parent_notebook, serial_manager):
@@ -19,6 +64,20 @@ class RulesTab:
         # Rules storage
         self.rules = []
         
+        # Tree item and the rule dict it shows, parallel to self.rules; rule dicts
+        # are replaced rather than edited, so an unchanged dict means an unchanged row
+        self._row_ids: List[str] = []
+        self._row_rules: List[Dict[str, Any]] = []
+        
+        # Type changes update the help label once per idle pass
+        self._help_pending = False
+        self._status_clear_job = None
+        
+        # Rule changes are pushed to the serial manager off the Tk thread,
+        # coalescing edits made within 50 ms of each other
+        self._rules_push_id = None
+        self._rules_executor = ThreadPoolExecutor(max_workers=1)
+        
         self.setup_ui()
 
     def setup_ui(self):
@@ -57,18 +116,19 @@ class RulesTab:
         list_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
         # Treeview for rules
-        self.rules_tree = ttk.Treeview(list_frame, columns=('Type', 'Pattern', 'Enabled'), 
+        self.rules_tree = ttk.Treeview(list_frame, columns=('Type', 'Pattern'), 
                                       show='tree headings', height=10)
         
         self.rules_tree.heading('#0', text='Description')
         self.rules_tree.heading('Type', text='Type')
         self.rules_tree.heading('Pattern', text='Pattern')
-        self.rules_tree.heading('Enabled', text='Enabled')
         
         self.rules_tree.column('#0', width=150)
         self.rules_tree.column('Type', width=60)
-        self.rules_tree.column('Pattern', width=100)
-        self.rules_tree.column('Enabled', width=60)
+        self.rules_tree.column('Pattern', width=160)
+        
+        # Disabled rules are greyed out instead of having an Enabled column
+        self.rules_tree.tag_configure('disabled', foreground='gray')
         
         # Scrollbar for treeview
         tree_scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.rules_tree.yview)
@@ -131,6 +191,9 @@ class RulesTab:
         self.rule_replacement = tk.Text(pattern_frame, height=3, wrap=tk.WORD)
         self.rule_replacement.pack(fill=tk.X, padx=5, pady=2)
         
+        # Last stripped contents of each editor, re-read only once it is modified
+        self._editor_text = {self.rule_pattern: '', self.rule_replacement: ''}
+        
         # Help text
         self.help_text = ttk.Label(pattern_frame, text="ASCII mode: Enter text directly\nHEX mode: Enter hex bytes separated by spaces (e.g., 41 42 43)")
         self.help_text.pack(anchor=tk.W, padx=5, pady=5)
@@ -159,6 +222,9 @@ class RulesTab:
         ttk.Button(button_frame, text="Save Rule", command=self.save_rule).pack(side=tk.RIGHT, padx=2)
         ttk.Button(button_frame, text="Cancel", command=self.cancel_edit).pack(side=tk.RIGHT, padx=2)
         
+        self.status_label = ttk.Label(button_frame, text="")
+        self.status_label.pack(side=tk.LEFT, padx=5)
+        
         # Current rule index
         self.current_rule_index = -1
 
@@ -167,8 +233,22 @@ class RulesTab:
         enabled = self.spoofing_enabled.get()
         self.serial_manager.set_spoofing_enabled(enabled)
 
+    def get_editor_text(self, widget: tk.Text) -> str:
+        """Return the stripped contents of a pattern editor"""
+        if widget.edit_modified():
+            self._editor_text[widget] = widget.get(1.0, tk.END).strip()
+            widget.edit_modified(False)
+        return self._editor_text[widget]
+
     def on_type_changed(self, event=None):
         """Handle rule type change"""
+        if not self._help_pending:
+            self._help_pending = True
+            self.frame.after_idle(self._apply_help_text)
+
+    def _apply_help_text(self):
+        """Show the help text for the currently selected rule type"""
+        self._help_pending = False
         rule_type = self.rule_type.get()
         if rule_type == 'ascii':
             help_text = "ASCII mode: Enter text directly"
@@ -183,12 +263,17 @@ class RulesTab:
         if not selection:
             return
         
-        item_id = selection[0]
-        rule_index = int(self.rules_tree.item(item_id)['values'][3])  # Hidden index
-        
-        if 0 <= rule_index < len(self.rules):
+        rule_index = self.rule_index_of(selection[0])
+        if rule_index >= 0:
             self.load_rule_for_editing(rule_index)
 
+    def rule_index_of(self, item_id: str) -> int:
+        """Return the index of the rule shown in a tree row, or -1"""
+        try:
+            return self._row_ids.index(item_id)
+        except ValueError:
+            return -1
+
     def new_rule(self):
         """Create a new rule"""
         self.clear_editor()
@@ -202,11 +287,12 @@ class RulesTab:
             return
         
         if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this rule?"):
-            item_id = selection[0]
-            rule_index = int(self.rules_tree.item(item_id)['values'][3])  # Hidden index
+            rule_index = self.rule_index_of(selection[0])
             
-            if 0 <= rule_index < len(self.rules):
+            if rule_index >= 0:
                 del self.rules[rule_index]
+                self.rules_tree.delete(self._row_ids.pop(rule_index))
+                del self._row_rules[rule_index]
                 self.update_rules_display()
                 self.update_serial_manager_rules()
                 self.clear_editor()
@@ -218,10 +304,9 @@ class RulesTab:
             messagebox.showwarning("No Selection", "Please select a rule to duplicate.")
             return
         
-        item_id = selection[0]
-        rule_index = int(self.rules_tree.item(item_id)['values'][3])  # Hidden index
+        rule_index = self.rule_index_of(selection[0])
         
-        if 0 <= rule_index < len(self.rules):
+        if rule_index >= 0:
             rule_copy = self.rules[rule_index].copy()
             rule_copy['description'] = f"{rule_copy['description']} (Copy)"
             self.rules.append(rule_copy)
@@ -267,12 +352,12 @@ class RulesTab:
             messagebox.showerror("Validation Error", "Please enter a description.")
             return
         
-        pattern = self.rule_pattern.get(1.0, tk.END).strip()
+        pattern = self.get_editor_text(self.rule_pattern)
         if not pattern:
             messagebox.showerror("Validation Error", "Please enter a pattern.")
             return
         
-        replacement = self.rule_replacement.get(1.0, tk.END).strip()
+        replacement = self.get_editor_text(self.rule_replacement)
         
         rule_type = self.rule_type.get()
         
@@ -280,9 +365,9 @@ class RulesTab:
         if rule_type == 'hex':
             try:
                 # Test pattern
-                bytes.fromhex(pattern.replace(' ', ''))
+                hex_to_bytes(pattern)
                 if replacement:
-                    bytes.fromhex(replacement.replace(' ', ''))
+                    hex_to_bytes(replacement)
             except ValueError:
                 messagebox.showerror("Validation Error", "Invalid hex format. Use format like: 41 42 43")
                 return
@@ -298,17 +383,33 @@ class RulesTab:
         
         # Save rule
         if self.current_rule_index >= 0:
-            # Update existing rule
+            # Update existing rule; a description-only edit needs no push
+            previous = self.rules[self.current_rule_index]
             self.rules[self.current_rule_index] = rule
+            matching_changed = _match_key(previous) != _match_key(rule)
         else:
             # Add new rule
             self.rules.append(rule)
+            matching_changed = True
         
         self.update_rules_display()
-        self.update_serial_manager_rules()
+        if matching_changed:
+            self.update_serial_manager_rules()
         self.clear_editor()
         
-        messagebox.showinfo("Success", "Rule saved successfully.")
+        self.show_status("Rule saved.", "green")
+
+    def show_status(self, text: str, foreground: str):
+        """Show a transient status message next to the save buttons"""
+        if self._status_clear_job:
+            self.frame.after_cancel(self._status_clear_job)
+        self.status_label.config(text=text, foreground=foreground)
+        self._status_clear_job = self.frame.after(1500, self.clear_status)
+
+    def clear_status(self):
+        """Clear the status message"""
+        self._status_clear_job = None
+        self.status_label.config(text="")
 
     def cancel_edit(self):
         """Cancel rule editing"""
@@ -316,8 +417,8 @@ class RulesTab:
 
     def test_rule(self):
         """Test the current rule"""
-        pattern = self.rule_pattern.get(1.0, tk.END).strip()
-        replacement = self.rule_replacement.get(1.0, tk.END).strip()
+        pattern = self.get_editor_text(self.rule_pattern)
+        replacement = self.get_editor_text(self.rule_replacement)
         test_data = self.test_data.get().strip()
         rule_type = self.rule_type.get()
         
@@ -327,25 +428,27 @@ class RulesTab:
         
         try:
             if rule_type == 'ascii':
-                if pattern in test_data:
-                    result = test_data.replace(pattern, replacement)
+                # One split finds every match; joining applies the replacement
+                parts = test_data.split(pattern)
+                if len(parts) > 1:
+                    result = replacement.join(parts)
                     self.test_result.config(text=f"Match! Result: {result}", foreground="green")
                 else:
                     self.test_result.config(text="No match found.", foreground="orange")
             else:  # hex
-                # Convert test data to hex if it's ASCII
-                if all(32 <= ord(c) <= 126 for c in test_data):
-                    test_hex = ' '.join(f'{ord(c):02X}' for c in test_data)
+                # Printable ASCII test data is used as-is, anything else is read as hex
+                if test_data.isascii() and test_data.isprintable():
+                    test_bytes = test_data.encode('ascii')
                 else:
-                    test_hex = test_data
+                    test_bytes = bytes.fromhex(test_data.replace(' ', ''))
                 
-                pattern_bytes = bytes.fromhex(pattern.replace(' ', ''))
-                replacement_bytes = bytes.fromhex(replacement.replace(' ', '')) if replacement else b''
-                test_bytes = bytes.fromhex(test_hex.replace(' ', ''))
+                pattern_bytes = hex_to_bytes(pattern)
+                replacement_bytes = hex_to_bytes(replacement) if replacement else b''
                 
-                if pattern_bytes in test_bytes:
-                    result_bytes = test_bytes.replace(pattern_bytes, replacement_bytes)
-                    result_hex = ' '.join(f'{b:02X}' for b in result_bytes)
+                parts = test_bytes.split(pattern_bytes)
+                if len(parts) > 1:
+                    result_bytes = replacement_bytes.join(parts)
+                    result_hex = result_bytes.hex(' ').upper()
                     self.test_result.config(text=f"Match! Result: {result_hex}", foreground="green")
                 else:
                     self.test_result.config(text="No match found.", foreground="orange")
@@ -359,28 +462,43 @@ class RulesTab:
         self.test_result.config(text="")
 
     def update_rules_display(self):
-        """Update the rules tree display"""
-        # Clear existing items
-        for item in self.rules_tree.get_children():
-            self.rules_tree.delete(item)
-        
-        # Add rules
+        """Sync the rules tree with self.rules, touching only rows that changed"""
+        shown = len(self._row_rules)
         for i, rule in enumerate(self.rules):
-            enabled_text = "Yes" if rule.get('enabled', True) else "No"
+            if i < shown and self._row_rules[i] is rule:
+                continue
+            
             pattern_preview = rule.get('pattern', '')[:20]
             if len(rule.get('pattern', '')) > 20:
                 pattern_preview += "..."
             
-            self.rules_tree.insert('', tk.END, 
-                                 text=rule.get('description', f'Rule {i+1}'),
-                                 values=(rule.get('type', 'ascii'), 
-                                        pattern_preview,
-                                        enabled_text,
-                                        i))  # Hidden index
+            text = rule.get('description', f'Rule {i+1}')
+            values = (rule.get('type', 'ascii'), pattern_preview)
+            tags = () if rule.get('enabled', True) else ('disabled',)
+            
+            if i < shown:
+                self.rules_tree.item(self._row_ids[i], text=text, values=values, tags=tags)
+                self._row_rules[i] = rule
+            else:
+                self._row_ids.append(self.rules_tree.insert('', tk.END, text=text, values=values, tags=tags))
+                self._row_rules.append(rule)
+        
+        # Remove rows left over from deleted rules
+        count = len(self.rules)
+        if len(self._row_ids) > count:
+            self.rules_tree.delete(*self._row_ids[count:])
+            del self._row_ids[count:]
+            del self._row_rules[count:]
 
     def update_serial_manager_rules(self):
-        """Update rules in serial manager"""
-        self.serial_manager.set_spoofing_rules(self.rules)
+        """Schedule an update of the rules in the serial manager"""
+        if self._rules_push_id is None:
+            self._rules_push_id = self.frame.after(50, self._push_rules)
+
+    def _push_rules(self):
+        """Hand a snapshot of the rules to the serial manager on the worker thread"""
+        self._rules_push_id = None
+        self._rules_executor.submit(self.serial_manager.set_spoofing_rules, list(self.rules))
 
     def import_rules(self):
         """Import rules from JSON file"""
@@ -391,14 +509,22 @@ class RulesTab:
         
         if filename:
             try:
-                with open(filename, 'r') as f:
+                with open(filename, 'rb', buffering=1 << 20) as f:
                     imported_rules = json.load(f)
                 
                 if isinstance(imported_rules, list):
-                    self.rules.extend(imported_rules)
+                    # Drop malformed entries instead of failing later on them
+                    valid_rules = [rule for rule in map(_normalize_rule, imported_rules) if rule is not None]
+                    skipped = len(imported_rules) - len(valid_rules)
+                    
+                    self.rules.extend(valid_rules)
                     self.update_rules_display()
                     self.update_serial_manager_rules()
-                    messagebox.showinfo("Success", f"Imported {len(imported_rules)} rules.")
+                    if skipped:
+                        messagebox.showwarning("Import", f"Imported {len(valid_rules)} rules, "
+                                               f"skipped {skipped} invalid rules.")
+                    else:
+                        messagebox.showinfo("Success", f"Imported {len(valid_rules)} rules.")
                 else:
                     messagebox.showerror("Error", "Invalid file format.")
                     
@@ -419,8 +545,13 @@ class RulesTab:
         
         if filename:
             try:
-                with open(filename, 'w') as f:
-                    json.dump(self.rules, f, indent=2)
+                # Encode the whole file up front and write it in one call
+                if orjson is not None:
+                    blob = orjson.dumps(self.rules, option=orjson.OPT_INDENT_2)
+                else:
+                    blob = json.dumps(self.rules, indent=2).encode('utf-8')
+                with open(filename, 'wb') as f:
+                    f.write(blob)
                 
                 messagebox.showinfo("Success", f"Exported {len(self.rules)} rules to {filename}")
                 
@@ -6,6 +6,114 @@ Manages application configuration
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import os
+import time
+from collections import ChainMap
+
+# pyserial's port enumeration is optional; without it the common ports are offered
+try:
+    from serial.tools.list_ports import comports as _comports
+except ImportError:
+    _comports = None
+
+# Well-known Linux/Unix serial devices offered alongside the detected ports
+_COMMON_PORTS = ('/dev/ttyUSB0', '/dev/ttyUSB1', '/dev/ttyUSB2', '/dev/ttyUSB3',
+                 '/dev/ttyACM0', '/dev/ttyACM1', '/dev/ttyS0', '/dev/ttyS1')
+_COMMON_PORT_NAMES = frozenset(os.path.basename(port) for port in _COMMON_PORTS)
+
+# Port scans are reused for this long, so repeated refreshes don't rescan
+_PORT_CACHE_TTL = 2.0
+_port_cache = {'time': 0.0, 'ports': None}
+
+# Config key and value type of every setting shown in the tab; defaults come
+# from the config manager
+_SETTINGS = (
+    # Serial settings
+    ('port_a', str),
+    ('port_b', str),
+    ('baud_rate', int),
+    ('data_bits', int),
+    ('parity', str),
+    ('stop_bits', float),
+    ('flow_control', str),
+    ('timeout', float),
+    
+    # Logging settings
+    ('log_folder', str),
+    ('log_format', str),
+    ('max_log_files', int),
+    ('log_level', str),
+    
+    # Protocol settings
+    ('auto_detect_protocol', bool),
+    ('default_protocol', str),
+    ('protocol_timeout', float),
+    ('message_timeout', float),
+    
+    # GUI settings
+    ('theme', str),
+    ('window_geometry', str),
+    ('auto_start', bool),
+    ('update_interval', int),
+    
+    # Advanced settings
+    ('buffer_size', int),
+    ('max_message_size', int),
+)
+
+# Font of the section headings inside each settings sub-tab
+_HEADING_FONT = ('TkDefaultFont', 10, 'bold')
+
+# Label/field rows of the settings sub-tabs: (label, config key, field kind,
+# grid row, grid column, width, choices). Kinds are 'entry', 'combo' (editable)
+# and 'readonly' (pick from the choices).
+_PORTS_LAYOUT = (
+    ("Port A:", 'port_a', 'combo', 0, 0, 20, None),
+    ("Port B:", 'port_b', 'combo', 1, 0, 20, None),
+)
+_COMM_LAYOUT = (
+    ("Baud Rate:", 'baud_rate', 'readonly', 0, 0, 10,
+     ['300', '600', '1200', '2400', '4800', '9600', '19200', '38400', '57600', '115200']),
+    ("Data Bits:", 'data_bits', 'readonly', 0, 2, 5, ['5', '6', '7', '8']),
+    ("Parity:", 'parity', 'readonly', 1, 0, 10, ['none', 'even', 'odd', 'mark', 'space']),
+    ("Stop Bits:", 'stop_bits', 'readonly', 1, 2, 5, ['1', '1.5', '2']),
+    ("Flow Control:", 'flow_control', 'readonly', 2, 0, 10, ['none', 'xonxoff', 'rtscts', 'dsrdtr']),
+    ("Timeout (s):", 'timeout', 'entry', 2, 2, 8, None),
+)
+_RETENTION_LAYOUT = (
+    ("Max Log Files:", 'max_log_files', 'entry', 0, 0, 10, None),
+    ("Log Level:", 'log_level', 'readonly', 1, 0, 10, ['DEBUG', 'INFO', 'WARNING', 'ERROR']),
+)
+_TIMEOUT_LAYOUT = (
+    ("Protocol Detection Timeout (s):", 'protocol_timeout', 'entry', 0, 0, 10, None),
+    ("Message Timeout (s):", 'message_timeout', 'entry', 1, 0, 10, None),
+)
+_APPEARANCE_LAYOUT = (
+    ("Theme:", 'theme', 'readonly', 0, 0, 10, ['light', 'dark']),
+    ("Window Size:", 'window_geometry', 'entry', 1, 0, 15, None),
+)
+_BEHAVIOR_LAYOUT = (
+    ("Update Interval (ms):", 'update_interval', 'entry', 1, 0, 10, None),
+)
+_BUFFER_LAYOUT = (
+    ("Buffer Size (bytes):", 'buffer_size', 'entry', 0, 0, 10, None),
+    ("Max Message Size (bytes):", 'max_message_size', 'entry', 1, 0, 10, None),
+)
+
+def _scan_ports() -> tuple:
+    """Return detected serial ports followed by any common ports present in /dev"""
+    ports = [port.device for port in _comports()]
+    
+    # One directory listing instead of an existence check per common port
+    try:
+        with os.scandir('/dev') as entries:
+            present = {entry.name for entry in entries if entry.name in _COMMON_PORT_NAMES}
+    except OSError:
+        present = set()
+    
+    ports.extend(port for port in _COMMON_PORTS if os.path.basename(port) in present)
+    
+    # Drop duplicates, keeping the first occurrence; a tuple is shared by every combo
+    return tuple(dict.fromkeys(ports))
 
 class SettingsTab:
     def __init__(self, parent_notebook, config_manager, config_callback):
@@ -19,6 +127,13 @@ class SettingsTab:
         # Current configuration
         self.config = {}
         
+        # Widget or Tk variable holding each setting, keyed by config key
+        self.fields = {}
+        self._status_clear_job = None
+        
+        # Last config handed to config_callback; None until the first apply
+        self._applied_config = None
+        
         self.setup_ui()
 
     def setup_ui(self):
@@ -27,12 +142,20 @@ class SettingsTab:
         self.settings_notebook = ttk.Notebook(self.frame)
         self.settings_notebook.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
-        # Create setting tabs
-        self.setup_serial_settings()
-        self.setup_logging_settings()
-        self.setup_protocol_settings()
-        self.setup_gui_settings()
-        self.setup_advanced_settings()
+        # Create setting tabs; each one's widgets are built the first time it is shown
+        self._tab_builders = {}
+        for index, (text, builder) in enumerate((("Serial Ports", self.setup_serial_settings),
+                                                 ("Logging", self.setup_logging_settings),
+                                                 ("Protocol", self.setup_protocol_settings),
+                                                 ("Interface", self.setup_gui_settings),
+                                                 ("Advanced", self.setup_advanced_settings))):
+            tab_frame = ttk.Frame(self.settings_notebook)
+            self.settings_notebook.add(tab_frame, text=text)
+            self._tab_builders[index] = (tab_frame, builder)
+        
+        # The first tab is visible straight away
+        self.build_settings_tab(0)
+        self.settings_notebook.bind('<<NotebookTabChanged>>', self.on_settings_tab_changed)
         
         # Control buttons
         button_frame = ttk.Frame(self.frame)
@@ -42,317 +165,234 @@ class SettingsTab:
         ttk.Button(button_frame, text="Reset to Defaults", command=self.reset_to_defaults).pack(side=tk.RIGHT, padx=2)
         ttk.Button(button_frame, text="Import Config", command=self.import_config).pack(side=tk.LEFT, padx=2)
         ttk.Button(button_frame, text="Export Config", command=self.export_config).pack(side=tk.LEFT, padx=2)
+        
+        self.status_label = ttk.Label(button_frame, text="")
+        self.status_label.pack(side=tk.LEFT, padx=10)
 
-    def setup_serial_settings(self):
-        """Setup serial port settings"""
-        serial_frame = ttk.Frame(self.settings_notebook)
-        self.settings_notebook.add(serial_frame, text="Serial Ports")
+    def on_settings_tab_changed(self, event=None):
+        """Build the selected settings tab if it hasn't been shown before"""
+        self.build_settings_tab(self.settings_notebook.index('current'))
+
+    def build_settings_tab(self, index: int):
+        """Create a settings tab's widgets and show the current config in them"""
+        entry = self._tab_builders.pop(index, None)
+        if entry is None:
+            return
+        
+        tab_frame, builder = entry
+        existing = set(self.fields)
+        builder(tab_frame)
+        self.load_fields(self.fields.keys() - existing)
+
+    def add_section(self, parent, text: str, row: int) -> int:
+        """Grid a section heading and return the first row below it"""
+        # Headings share the tab's grid instead of opening a LabelFrame per section
+        ttk.Label(parent, text=text, font=_HEADING_FONT).grid(row=row, column=0, columnspan=4, sticky=tk.W,
+                                                              padx=5, pady=(10, 2))
+        return row + 1
+
+    def add_setting_rows(self, parent, layout, first_row: int = 0) -> int:
+        """Create and grid the label and field of each row in a layout table, returning the next free row"""
+        next_row = first_row
+        for label, key, kind, row, column, width, values in layout:
+            row += first_row
+            ttk.Label(parent, text=label).grid(row=row, column=column, sticky=tk.W, padx=20 if column else 5, pady=2)
+            
+            if kind == 'entry':
+                field = ttk.Entry(parent, width=width)
+            elif kind == 'readonly':
+                field = ttk.Combobox(parent, values=values, state="readonly", width=width)
+            else:
+                field = ttk.Combobox(parent, width=width)
+            
+            field.grid(row=row, column=column + 1, sticky=tk.W, padx=5, pady=2)
+            self.fields[key] = field
+            next_row = max(next_row, row + 1)
         
+        return next_row
+
+    def setup_serial_settings(self, serial_frame):
+        """Setup serial port settings"""
         # Port configuration
-        ports_frame = ttk.LabelFrame(serial_frame, text="Port Configuration")
-        ports_frame.pack(fill=tk.X, padx=5, pady=5)
-        
-        # Port A
-        ttk.Label(ports_frame, text="Port A:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=2)
-        self.port_a_var = tk.StringVar()
-        port_a_combo = ttk.Combobox(ports_frame, textvariable=self.port_a_var, width=20)
-        port_a_combo.grid(row=0, column=1, sticky=tk.W, padx=5, pady=2)
-        
-        # Port B
-        ttk.Label(ports_frame, text="Port B:").grid(row=1, column=0, sticky=tk.W, padx=5, pady=2)
-        self.port_b_var = tk.StringVar()
-        port_b_combo = ttk.Combobox(ports_frame, textvariable=self.port_b_var, width=20)
-        port_b_combo.grid(row=1, column=1, sticky=tk.W, padx=5, pady=2)
+        ports_row = self.add_section(serial_frame, "Port Configuration", 0)
+        row = self.add_setting_rows(serial_frame, _PORTS_LAYOUT, ports_row)
+        port_combos = [self.fields['port_a'], self.fields['port_b']]
         
         # Populate port lists
-        self.populate_port_lists([port_a_combo, port_b_combo])
+        self.populate_port_lists(port_combos)
         
         # Refresh button
-        ttk.Button(ports_frame, text="Refresh Ports", 
-                  command=lambda: self.populate_port_lists([port_a_combo, port_b_combo])).grid(row=0, column=2, padx=10, pady=2)
+        ttk.Button(serial_frame, text="Refresh Ports", 
+                  command=lambda: self.populate_port_lists(port_combos, rescan=True)).grid(row=ports_row, column=2, padx=10, pady=2)
         
         # Communication parameters
-        comm_frame = ttk.LabelFrame(serial_frame, text="Communication Parameters")
-        comm_frame.pack(fill=tk.X, padx=5, pady=5)
-        
-        # Baud rate
-        ttk.Label(comm_frame, text="Baud Rate:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=2)
-        self.baud_rate_var = tk.StringVar()
-        baud_combo = ttk.Combobox(comm_frame, textvariable=self.baud_rate_var, 
-                                 values=['300', '600', '1200', '2400', '4800', '9600', '19200', '38400', '57600', '115200'],
-                                 state="readonly", width=10)
-        baud_combo.grid(row=0, column=1, sticky=tk.W, padx=5, pady=2)
-        
-        # Data bits
-        ttk.Label(comm_frame, text="Data Bits:").grid(row=0, column=2, sticky=tk.W, padx=20, pady=2)
-        self.data_bits_var = tk.StringVar()
-        ttk.Combobox(comm_frame, textvariable=self.data_bits_var, 
-                    values=['5', '6', '7', '8'], state="readonly", width=5).grid(row=0, column=3, sticky=tk.W, padx=5, pady=2)
-        
-        # Parity
-        ttk.Label(comm_frame, text="Parity:").grid(row=1, column=0, sticky=tk.W, padx=5, pady=2)
-        self.parity_var = tk.StringVar()
-        ttk.Combobox(comm_frame, textvariable=self.parity_var, 
-                    values=['none', 'even', 'odd', 'mark', 'space'], state="readonly", width=10).grid(row=1, column=1, sticky=tk.W, padx=5, pady=2)
-        
-        # Stop bits
-        ttk.Label(comm_frame, text="Stop Bits:").grid(row=1, column=2, sticky=tk.W, padx=20, pady=2)
-        self.stop_bits_var = tk.StringVar()
-        ttk.Combobox(comm_frame, textvariable=self.stop_bits_var, 
-                    values=['1', '1.5', '2'], state="readonly", width=5).grid(row=1, column=3, sticky=tk.W, padx=5, pady=2)
-        
-        # Flow control
-        ttk.Label(comm_frame, text="Flow Control:").grid(row=2, column=0, sticky=tk.W, padx=5, pady=2)
-        self.flow_control_var = tk.StringVar()
-        ttk.Combobox(comm_frame, textvariable=self.flow_control_var, 
-                    values=['none', 'xonxoff', 'rtscts', 'dsrdtr'], state="readonly", width=10).grid(row=2, column=1, sticky=tk.W, padx=5, pady=2)
-        
-        # Timeout
-        ttk.Label(comm_frame, text="Timeout (s):").grid(row=2, column=2, sticky=tk.W, padx=20, pady=2)
-        self.timeout_var = tk.StringVar()
-        ttk.Entry(comm_frame, textvariable=self.timeout_var, width=8).grid(row=2, column=3, sticky=tk.W, padx=5, pady=2)
+        row = self.add_section(serial_frame, "Communication Parameters", row)
+        self.add_setting_rows(serial_frame, _COMM_LAYOUT, row)
 
-    def setup_logging_settings(self):
+    def setup_logging_settings(self, logging_frame):
         """Setup logging settings"""
-        logging_frame = ttk.Frame(self.settings_notebook)
-        self.settings_notebook.add(logging_frame, text="Logging")
-        
         # Log folder
-        folder_frame = ttk.LabelFrame(logging_frame, text="Log Storage")
-        folder_frame.pack(fill=tk.X, padx=5, pady=5)
+        row = self.add_section(logging_frame, "Log Storage", 0)
         
-        ttk.Label(folder_frame, text="Log Folder:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=2)
-        self.log_folder_var = tk.StringVar()
-        ttk.Entry(folder_frame, textvariable=self.log_folder_var, width=40).grid(row=0, column=1, sticky=tk.EW, padx=5, pady=2)
-        ttk.Button(folder_frame, text="Browse", command=self.browse_log_folder).grid(row=0, column=2, padx=5, pady=2)
+        ttk.Label(logging_frame, text="Log Folder:").grid(row=row, column=0, sticky=tk.W, padx=5, pady=2)
+        self.fields['log_folder'] = ttk.Entry(logging_frame, width=40)
+        self.fields['log_folder'].grid(row=row, column=1, sticky=tk.EW, padx=5, pady=2)
+        ttk.Button(logging_frame, text="Browse", command=self.browse_log_folder).grid(row=row, column=2, padx=5, pady=2)
         
-        folder_frame.columnconfigure(1, weight=1)
+        logging_frame.columnconfigure(1, weight=1)
         
         # Log format
-        format_frame = ttk.LabelFrame(logging_frame, text="Log Format")
-        format_frame.pack(fill=tk.X, padx=5, pady=5)
+        row = self.add_section(logging_frame, "Log Format", row + 1)
         
-        self.log_format_var = tk.StringVar()
-        ttk.Radiobutton(format_frame, text="ASCII only", variable=self.log_format_var, value="ascii").pack(anchor=tk.W, padx=5, pady=2)
-        ttk.Radiobutton(format_frame, text="HEX only", variable=self.log_format_var, value="hex").pack(anchor=tk.W, padx=5, pady=2)
-        ttk.Radiobutton(format_frame, text="Both ASCII and HEX", variable=self.log_format_var, value="both").pack(anchor=tk.W, padx=5, pady=2)
+        self.fields['log_format'] = tk.StringVar()
+        for text, value in (("ASCII only", "ascii"), ("HEX only", "hex"), ("Both ASCII and HEX", "both")):
+            ttk.Radiobutton(logging_frame, text=text, variable=self.fields['log_format'],
+                            value=value).grid(row=row, column=0, columnspan=3, sticky=tk.W, padx=5, pady=2)
+            row += 1
         
         # Log retention
-        retention_frame = ttk.LabelFrame(logging_frame, text="Log Retention")
-        retention_frame.pack(fill=tk.X, padx=5, pady=5)
-        
-        ttk.Label(retention_frame, text="Max Log Files:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=2)
-        self.max_log_files_var = tk.StringVar()
-        ttk.Entry(retention_frame, textvariable=self.max_log_files_var, width=10).grid(row=0, column=1, sticky=tk.W, padx=5, pady=2)
-        
-        ttk.Label(retention_frame, text="Log Level:").grid(row=1, column=0, sticky=tk.W, padx=5, pady=2)
-        self.log_level_var = tk.StringVar()
-        ttk.Combobox(retention_frame, textvariable=self.log_level_var, 
-                    values=['DEBUG', 'INFO', 'WARNING', 'ERROR'], state="readonly", width=10).grid(row=1, column=1, sticky=tk.W, padx=5, pady=2)
+        row = self.add_section(logging_frame, "Log Retention", row)
+        self.add_setting_rows(logging_frame, _RETENTION_LAYOUT, row)
 
-    def setup_protocol_settings(self):
+    def setup_protocol_settings(self, protocol_frame):
         """Setup protocol settings"""
-        protocol_frame = ttk.Frame(self.settings_notebook)
-        self.settings_notebook.add(protocol_frame, text="Protocol")
-        
         # Auto-detection
-        detection_frame = ttk.LabelFrame(protocol_frame, text="Protocol Detection")
-        detection_frame.pack(fill=tk.X, padx=5, pady=5)
+        row = self.add_section(protocol_frame, "Protocol Detection", 0)
         
-        self.auto_detect_var = tk.BooleanVar()
-        ttk.Checkbutton(detection_frame, text="Enable automatic protocol detection", 
-                       variable=self.auto_detect_var).pack(anchor=tk.W, padx=5, pady=2)
+        self.fields['auto_detect_protocol'] = tk.BooleanVar()
+        ttk.Checkbutton(protocol_frame, text="Enable automatic protocol detection", 
+                       variable=self.fields['auto_detect_protocol']).grid(row=row, column=0, columnspan=2, sticky=tk.W, padx=5, pady=2)
         
-        ttk.Label(detection_frame, text="Default Protocol:").pack(anchor=tk.W, padx=5, pady=2)
-        self.default_protocol_var = tk.StringVar()
-        ttk.Combobox(detection_frame, textvariable=self.default_protocol_var, 
-                    values=['Raw', 'Modbus RTU', 'Modbus ASCII', 'NMEA', 'ASCII Delimited'], 
-                    state="readonly", width=20).pack(anchor=tk.W, padx=5, pady=2)
+        ttk.Label(protocol_frame, text="Default Protocol:").grid(row=row + 1, column=0, sticky=tk.W, padx=5, pady=2)
+        self.fields['default_protocol'] = ttk.Combobox(protocol_frame, 
+                                                       values=['Raw', 'Modbus RTU', 'Modbus ASCII', 'NMEA', 'ASCII Delimited'], 
+                                                       state="readonly", width=20)
+        self.fields['default_protocol'].grid(row=row + 1, column=1, sticky=tk.W, padx=5, pady=2)
         
         # Timeouts
-        timeout_frame = ttk.LabelFrame(protocol_frame, text="Protocol Timeouts")
-        timeout_frame.pack(fill=tk.X, padx=5, pady=5)
-        
-        ttk.Label(timeout_frame, text="Protocol Detection Timeout (s):").grid(row=0, column=0, sticky=tk.W, padx=5, pady=2)
-        self.protocol_timeout_var = tk.StringVar()
-        ttk.Entry(timeout_frame, textvariable=self.protocol_timeout_var, width=10).grid(row=0, column=1, sticky=tk.W, padx=5, pady=2)
-        
-        ttk.Label(timeout_frame, text="Message Timeout (s):").grid(row=1, column=0, sticky=tk.W, padx=5, pady=2)
-        self.message_timeout_var = tk.StringVar()
-        ttk.Entry(timeout_frame, textvariable=self.message_timeout_var, width=10).grid(row=1, column=1, sticky=tk.W, padx=5, pady=2)
+        row = self.add_section(protocol_frame, "Protocol Timeouts", row + 2)
+        self.add_setting_rows(protocol_frame, _TIMEOUT_LAYOUT, row)
 
-    def setup_gui_settings(self):
+    def setup_gui_settings(self, gui_frame):
         """Setup GUI settings"""
-        gui_frame = ttk.Frame(self.settings_notebook)
-        self.settings_notebook.add(gui_frame, text="Interface")
-        
         # Appearance
-        appearance_frame = ttk.LabelFrame(gui_frame, text="Appearance")
-        appearance_frame.pack(fill=tk.X, padx=5, pady=5)
-        
-        ttk.Label(appearance_frame, text="Theme:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=2)
-        self.theme_var = tk.StringVar()
-        ttk.Combobox(appearance_frame, textvariable=self.theme_var, 
-                    values=['light', 'dark'], state="readonly", width=10).grid(row=0, column=1, sticky=tk.W, padx=5, pady=2)
-        
-        ttk.Label(appearance_frame, text="Window Size:").grid(row=1, column=0, sticky=tk.W, padx=5, pady=2)
-        self.window_geometry_var = tk.StringVar()
-        ttk.Entry(appearance_frame, textvariable=self.window_geometry_var, width=15).grid(row=1, column=1, sticky=tk.W, padx=5, pady=2)
+        row = self.add_section(gui_frame, "Appearance", 0)
+        row = self.add_setting_rows(gui_frame, _APPEARANCE_LAYOUT, row)
         
         # Behavior
-        behavior_frame = ttk.LabelFrame(gui_frame, text="Behavior")
-        behavior_frame.pack(fill=tk.X, padx=5, pady=5)
-        
-        self.auto_start_var = tk.BooleanVar()
-        ttk.Checkbutton(behavior_frame, text="Auto-start monitoring on connection", 
-                       variable=self.auto_start_var).pack(anchor=tk.W, padx=5, pady=2)
+        row = self.add_section(gui_frame, "Behavior", row)
         
-        ttk.Label(behavior_frame, text="Update Interval (ms):").grid(row=1, column=0, sticky=tk.W, padx=5, pady=2)
-        self.update_interval_var = tk.StringVar()
-        ttk.Entry(behavior_frame, textvariable=self.update_interval_var, width=10).grid(row=1, column=1, sticky=tk.W, padx=5, pady=2)
+        self.fields['auto_start'] = tk.BooleanVar()
+        ttk.Checkbutton(gui_frame, text="Auto-start monitoring on connection", 
+                       variable=self.fields['auto_start']).grid(row=row, column=0, columnspan=2, sticky=tk.W, padx=5, pady=2)
+        self.add_setting_rows(gui_frame, _BEHAVIOR_LAYOUT, row)
 
-    def setup_advanced_settings(self):
+    def setup_advanced_settings(self, advanced_frame):
         """Setup advanced settings"""
-        advanced_frame = ttk.Frame(self.settings_notebook)
-        self.settings_notebook.add(advanced_frame, text="Advanced")
-        
         # Buffer settings
-        buffer_frame = ttk.LabelFrame(advanced_frame, text="Buffer Settings")
-        buffer_frame.pack(fill=tk.X, padx=5, pady=5)
-        
-        ttk.Label(buffer_frame, text="Buffer Size (bytes):").grid(row=0, column=0, sticky=tk.W, padx=5, pady=2)
-        self.buffer_size_var = tk.StringVar()
-        ttk.Entry(buffer_frame, textvariable=self.buffer_size_var, width=10).grid(row=0, column=1, sticky=tk.W, padx=5, pady=2)
-        
-        ttk.Label(buffer_frame, text="Max Message Size (bytes):").grid(row=1, column=0, sticky=tk.W, padx=5, pady=2)
-        self.max_message_size_var = tk.StringVar()
-        ttk.Entry(buffer_frame, textvariable=self.max_message_size_var, width=10).grid(row=1, column=1, sticky=tk.W, padx=5, pady=2)
+        row = self.add_section(advanced_frame, "Buffer Settings", 0)
+        row = self.add_setting_rows(advanced_frame, _BUFFER_LAYOUT, row)
         
         # Performance
-        performance_frame = ttk.LabelFrame(advanced_frame, text="Performance")
-        performance_frame.pack(fill=tk.X, padx=5, pady=5)
+        row = self.add_section(advanced_frame, "Performance", row)
         
-        ttk.Label(performance_frame, text="These settings affect performance and should only be changed by advanced users.").pack(anchor=tk.W, padx=5, pady=2)
+        ttk.Label(advanced_frame, text="These settings affect performance and should only be changed by advanced users.").grid(
+            row=row, column=0, columnspan=4, sticky=tk.W, padx=5, pady=2)
         
         # Reset button
         ttk.Button(advanced_frame, text="Reset Advanced Settings", 
-                  command=self.reset_advanced_settings).pack(pady=10)
+                  command=self.reset_advanced_settings).grid(row=row + 1, column=0, columnspan=4, pady=10)
 
-    def populate_port_lists(self, combo_boxes):
-        """Populate serial port combo boxes"""
-        try:
-            import serial.tools.list_ports
-            ports = [port.device for port in serial.tools.list_ports.comports()]
-            
-            # Add common Linux/Unix ports
-            common_ports = ['/dev/ttyUSB0', '/dev/ttyUSB1', '/dev/ttyUSB2', '/dev/ttyUSB3',
-                           '/dev/ttyACM0', '/dev/ttyACM1', '/dev/ttyS0', '/dev/ttyS1']
-            
-            for port in common_ports:
-                if port not in ports and os.path.exists(port):
-                    ports.append(port)
-            
-            # Update combo boxes
-            for combo in combo_boxes:
-                combo['values'] = ports
-                
-        except ImportError:
+    def populate_port_lists(self, combo_boxes, rescan: bool = False):
+        """Populate serial port combo boxes; rescan skips the cached port list"""
+        if _comports is None:
             # Fallback if pyserial tools not available
-            common_ports = ['/dev/ttyUSB0', '/dev/ttyUSB1', '/dev/ttyUSB2', '/dev/ttyUSB3',
-                           '/dev/ttyACM0', '/dev/ttyACM1', '/dev/ttyS0', '/dev/ttyS1']
-            for combo in combo_boxes:
-                combo['values'] = common_ports
+            ports = _COMMON_PORTS
+        else:
+            now = time.monotonic()
+            if (rescan or _port_cache['ports'] is None or
+                    now - _port_cache['time'] >= _PORT_CACHE_TTL):
+                _port_cache['ports'] = _scan_ports()
+                _port_cache['time'] = now
+            ports = _port_cache['ports']
+        
+        # Update combo boxes
+        for combo in combo_boxes:
+            combo.configure(values=ports)
 
     def browse_log_folder(self):
         """Browse for log folder"""
         folder = filedialog.askdirectory(title="Select Log Folder")
         if folder:
-            self.log_folder_var.set(folder)
+            self.set_field('log_folder', folder)
+
+    def set_field(self, key: str, value):
+        """Show a setting value in its widget or Tk variable"""
+        field = self.fields[key]
+        # Re-loading an unchanged config leaves the widgets alone
+        if field.get() == value:
+            return
+        
+        if isinstance(field, (tk.Variable, ttk.Combobox)):
+            field.set(value)
+        else:
+            field.delete(0, tk.END)
+            field.insert(0, value)
+
+    def load_fields(self, keys):
+        """Show the current config's values in the fields for the given keys"""
+        values = ChainMap(self.config, self.config_manager.default_config)
+        for key, kind in _SETTINGS:
+            if key in keys:
+                value = values[key]
+                self.set_field(key, value if kind is bool else str(value))
 
     def load_config(self, config):
         """Load configuration into UI"""
         self.config = config
         
-        # Serial settings
-        self.port_a_var.set(config.get('port_a', '/dev/ttyUSB0'))
-        self.port_b_var.set(config.get('port_b', '/dev/ttyUSB1'))
-        self.baud_rate_var.set(str(config.get('baud_rate', 9600)))
-        self.data_bits_var.set(str(config.get('data_bits', 8)))
-        self.parity_var.set(config.get('parity', 'none'))
-        self.stop_bits_var.set(str(config.get('stop_bits', 1)))
-        self.flow_control_var.set(config.get('flow_control', 'none'))
-        self.timeout_var.set(str(config.get('timeout', 1.0)))
-        
-        # Logging settings
-        self.log_folder_var.set(config.get('log_folder', './logs'))
-        self.log_format_var.set(config.get('log_format', 'both'))
-        self.max_log_files_var.set(str(config.get('max_log_files', 30)))
-        self.log_level_var.set(config.get('log_level', 'INFO'))
-        
-        # Protocol settings
-        self.auto_detect_var.set(config.get('auto_detect_protocol', True))
-        self.default_protocol_var.set(config.get('default_protocol', 'Raw'))
-        self.protocol_timeout_var.set(str(config.get('protocol_timeout', 5.0)))
-        self.message_timeout_var.set(str(config.get('message_timeout', 1.0)))
-        
-        # GUI settings
-        self.theme_var.set(config.get('theme', 'light'))
-        self.window_geometry_var.set(config.get('window_geometry', '1200x800'))
-        self.auto_start_var.set(config.get('auto_start', False))
-        self.update_interval_var.set(str(config.get('update_interval', 1000)))
-        
-        # Advanced settings
-        self.buffer_size_var.set(str(config.get('buffer_size', 4096)))
-        self.max_message_size_var.set(str(config.get('max_message_size', 1024)))
+        # Tabs not built yet pick the values up from self.config when first shown
+        self.load_fields(self.fields.keys())
 
     def apply_settings(self):
         """Apply current settings"""
         try:
             # Collect all settings
-            new_config = {
-                # Serial settings
-                'port_a': self.port_a_var.get(),
-                'port_b': self.port_b_var.get(),
-                'baud_rate': int(self.baud_rate_var.get()),
-                'data_bits': int(self.data_bits_var.get()),
-                'parity': self.parity_var.get(),
-                'stop_bits': float(self.stop_bits_var.get()),
-                'flow_control': self.flow_control_var.get(),
-                'timeout': float(self.timeout_var.get()),
-                
-                # Logging settings
-                'log_folder': self.log_folder_var.get(),
-                'log_format': self.log_format_var.get(),
-                'max_log_files': int(self.max_log_files_var.get()),
-                'log_level': self.log_level_var.get(),
-                
-                # Protocol settings
-                'auto_detect_protocol': self.auto_detect_var.get(),
-                'default_protocol': self.default_protocol_var.get(),
-                'protocol_timeout': float(self.protocol_timeout_var.get()),
-                'message_timeout': float(self.message_timeout_var.get()),
-                
-                # GUI settings
-                'theme': self.theme_var.get(),
-                'window_geometry': self.window_geometry_var.get(),
-                'auto_start': self.auto_start_var.get(),
-                'update_interval': int(self.update_interval_var.get()),
-                
-                # Advanced settings
-                'buffer_size': int(self.buffer_size_var.get()),
-                'max_message_size': int(self.max_message_size_var.get()),
-                
+            values = ChainMap(self.config, self.config_manager.default_config)
+            new_config = {}
+            for key, kind in _SETTINGS:
+                value = self.fields[key].get() if key in self.fields else values[key]
+                try:
+                    new_config[key] = kind(value)
+                except ValueError:
+                    # Stop at the first bad field and name it in the error
+                    raise ValueError(f"{key} = {value!r}") from None
+            new_config.update({
                 # Preserve existing settings
                 'spoofing_enabled': self.config.get('spoofing_enabled', True),
                 'spoofing_rules': self.config.get('spoofing_rules', [])
-            }
+            })
+            
+            # Nothing edited since the last apply: skip validation and reconfiguration
+            if new_config == self._applied_config:
+                self.show_status("No changes to apply.", "gray")
+                return
             
             # Validate configuration
             validated_config = self.config_manager.validate_config(new_config)
             
-            # Apply configuration
+            # Apply configuration, telling the callback which keys changed since the
+            # last apply so it can skip reconfiguring anything that doesn't depend on them
+            applied = self._applied_config
+            changed = None if applied is None else {key for key, value in validated_config.items()
+                                                    if applied.get(key) != value}
+            if changed == set():
+                # Edits that validation sanitized back to the applied values
+                self.show_status("No changes to apply.", "gray")
+                return
             if self.config_callback:
-                self.config_callback(validated_config)
+                self.config_callback(validated_config, changed)
+            self._applied_config = validated_config
             
             messagebox.showinfo("Success", "Settings applied successfully.")
             
@@ -364,15 +404,27 @@ class SettingsTab:
     def reset_to_defaults(self):
         """Reset all settings to defaults"""
         if messagebox.askyesno("Reset Settings", "Are you sure you want to reset all settings to defaults?"):
-            default_config = self.config_manager.default_config.copy()
-            self.load_config(default_config)
-            messagebox.showinfo("Reset Complete", "All settings have been reset to defaults.")
+            # The defaults are read-only, so they can be shown without a copy
+            self.load_config(self.config_manager.default_config)
+            self.show_status("All settings have been reset to defaults.", "green")
+
+    def show_status(self, text: str, foreground: str):
+        """Show a transient status message next to the config buttons"""
+        if self._status_clear_job:
+            self.frame.after_cancel(self._status_clear_job)
+        self.status_label.config(text=text, foreground=foreground)
+        self._status_clear_job = self.frame.after(2000, self.clear_status)
+
+    def clear_status(self):
+        """Clear the status message"""
+        self._status_clear_job = None
+        self.status_label.config(text="")
 
     def reset_advanced_settings(self):
         """Reset only advanced settings"""
         if messagebox.askyesno("Reset Advanced", "Reset advanced settings to defaults?"):
-            self.buffer_size_var.set(str(self.config_manager.default_config['buffer_size']))
-            self.max_message_size_var.set(str(self.config_manager.default_config['max_message_size']))
+            self.set_field('buffer_size', str(self.config_manager.default_config['buffer_size']))
+            self.set_field('max_message_size', str(self.config_manager.default_config['max_message_size']))
 
     def import_config(self):
         """Import configuration from file"""
@@ -15,6 +15,9 @@ import os
 import tkinter as tk
 from tkinter import messagebox
 import logging
+import logging.handlers
+import queue
+import atexit
 
 # Add the current directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -32,17 +35,53 @@ def setup_logging():
     log_dir = os.path.join(os.path.dirname(__file__), 'logs')
     os.makedirs(log_dir, exist_ok=True)
     
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(os.path.join(log_dir, 'application.log')),
-            logging.StreamHandler()
-        ]
-    )
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    handlers = [
+        logging.FileHandler(os.path.join(log_dir, 'application.log')),
+        logging.StreamHandler()
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    # Callers only enqueue records; a listener thread does the file and console writes
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.INFO)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+def _permission_stamp():
+    """Return the cache file and stamp of a passed permission check, or None"""
+    try:
+        # The process's groups come from the kernel, so they cover NSS/LDAP
+        # group changes that never touch /etc/group, without any lookup
+        groups = ','.join(map(str, sorted(os.getgroups())))
+        stamp = f"{os.getuid()}:{os.stat('/etc/group').st_mtime_ns}:{groups}"
+    except (AttributeError, OSError):
+        return None
+    
+    cache_dir = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_dir, 'rs232_spoofer', 'perm_ok'), stamp
 
 def check_permissions():
     """Check if user has permissions for serial ports"""
+    # A passed check is remembered until the uid, the process's groups or
+    # /etc/group change, which skips the passwd/group lookups (slow when NSS
+    # goes over the network). The file holds the stamp and the dialout gid.
+    cached = _permission_stamp()
+    if cached:
+        stamp_file, stamp = cached
+        try:
+            with open(stamp_file) as f:
+                saved_stamp, _, saved_gid = f.read().partition('\n')
+            if saved_stamp == stamp and int(saved_gid) in os.getgroups():
+                return
+        except (OSError, ValueError):
+            pass
+    
     import grp
     import pwd
     
@@ -51,7 +90,12 @@ def check_permissions():
         user = pwd.getpwuid(os.getuid()).pw_name
         dialout_group = grp.getgrnam('dialout')
         
-        if user not in dialout_group.gr_mem:
+        if user in dialout_group.gr_mem:
+            if cached:
+                os.makedirs(os.path.dirname(stamp_file), exist_ok=True)
+                with open(stamp_file, 'w') as f:
+                    f.write(f"{stamp}\n{dialout_group.gr_gid}")
+        else:
             messagebox.showwarning(
                 "Permission Warning",
                 f"User '{user}' is not in the 'dialout' group.\n\n"
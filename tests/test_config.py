@@ -0,0 +1,14 @@
+"""
+Tests for configuration loading
+"""
+
+from core.config import ConfigManager
+
+
+def test_loaded_config_does_not_share_default_rules(tmp_path):
+    manager = ConfigManager(str(tmp_path / "config.json"))
+    
+    manager.load_config()['spoofing_rules'].append({'pattern': 'x'})
+    
+    assert manager.default_config['spoofing_rules'] == []
+    assert manager.load_config()['spoofing_rules'] == []
@@ -0,0 +1,50 @@
+"""
+Tests for the protocol parser
+"""
+
+import json
+
+from core.protocol_parser import ProtocolParser, ProtocolType
+
+
+def test_raw_parsed_data_is_json_serializable():
+    message = ProtocolParser().parse_message(b'\x00\xffAB', ProtocolType.RAW)
+    
+    assert isinstance(message.parsed_data, dict)
+    assert json.loads(json.dumps(message.parsed_data)) == {
+        'length': 4,
+        'is_ascii': False,
+        'ascii_text': '',
+        'hex_dump': '00 FF 41 42',
+        'binary_repr': '00000000 11111111 01000001 01000010',
+    }
+
+
+def test_custom_binary_dumps_render_on_access():
+    message = ProtocolParser().parse_message(b'A\x01', ProtocolType.CUSTOM_BINARY)
+    
+    assert message.parsed_data['ascii_repr'] == 'A.'
+    assert dict(message.parsed_data) == {'length': 2, 'hex_dump': '41 01', 'ascii_repr': 'A.'}
+
+
+def test_lazy_fields_compare_after_rendering():
+    expected = {'length': 2, 'hex_dump': '41 01', 'ascii_repr': 'A.'}
+    parser = ProtocolParser()
+    
+    # Compare straight away, before any dump has been rendered
+    assert not (parser.parse_message(b'A\x01', ProtocolType.CUSTOM_BINARY).parsed_data != expected)
+    assert parser.parse_message(b'A\x01', ProtocolType.CUSTOM_BINARY).parsed_data == expected
+    assert parser.parse_message(b'A\x02', ProtocolType.CUSTOM_BINARY).parsed_data != expected
+
+
+def test_nmea_checksum_ignores_leading_whitespace():
+    sentence = b'$GPGGA,123519,4807.038,N*'
+    checksum = 0
+    for byte in sentence[1:-1]:
+        checksum ^= byte
+    data = b'  ' + sentence + f'{checksum:02X}\r\n'.encode('ascii')
+    
+    message = ProtocolParser().parse_message(data, ProtocolType.NMEA)
+    
+    assert message.is_valid
+    assert message.parsed_data['checksum_calculated'] == f'0x{checksum:02X}'
@@ -0,0 +1,57 @@
+"""
+Tests for the serial manager's message framing and port writes
+"""
+
+import os
+
+import pytest
+
+from core.serial_manager import SerialManager
+
+
+def extract(manager, buffer):
+    """Run one extraction pass, dropping consumed bytes like the read loop does"""
+    messages, consumed = manager._extract_messages(buffer)
+    del buffer[:consumed]
+    return messages
+
+
+def test_ascii_frame_split_across_reads_stays_buffered():
+    manager = SerialManager()
+    buffer = bytearray(b'$GPGGA,1')
+    
+    assert extract(manager, buffer) == []
+    assert buffer == b'$GPGGA,1'
+    
+    buffer += b'23*00\r\n:0103'
+    assert extract(manager, buffer) == [b'$GPGGA,123*00\r\n']
+    assert buffer == b':0103'
+    
+    buffer += b'00000001FB\r\n'
+    assert extract(manager, buffer) == [b':010300000001FB\r\n']
+    assert buffer == b''
+
+
+
+def test_rtu_frame_from_ascii_start_byte_address_is_forwarded():
+    manager = SerialManager()
+    
+    for frame in (b'\x24\x03\x00\x00\x00\x01\x85\xdb', b'\x3a\x03\x00\x00\x00\x01\x84\xe1'):
+        buffer = bytearray(frame)
+        assert extract(manager, buffer) == [frame]
+        assert buffer == b''
+
+
+def test_write_to_stalled_port_times_out():
+    manager = SerialManager()
+    manager.timeout = 0.1
+    read_fd, write_fd = os.pipe()
+    os.set_blocking(write_fd, False)
+    
+    try:
+        # Nobody reads the pipe, so it fills up and stops accepting data
+        with pytest.raises(TimeoutError):
+            manager._write_fd(write_fd, b'x' * (1 << 20))
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)